@@ -10,7 +10,10 @@ with overlapping generations where
 import numpy as np
 from dataclasses import dataclass
 from scipy.optimize import root_scalar
+from scipy.linalg import solve_banded
+from scipy.signal import lfilter
 import copy
+import os
 import matplotlib.pyplot as plt
 from matplotlib.ticker import PercentFormatter
 
@@ -60,6 +63,11 @@ class Simulation:
     K: np.ndarray = None        # Time series for aggregate capital stock
     Y: np.ndarray = None        # Time series for aggregate output
     z: np.ndarray = None        # Time series for TFP
+    data: np.ndarray = None     # Buffer holding all time series (one row each)
+
+
+# Order of time series in the buffer Simulation.data
+SIM_VARIABLES = ('c_y', 'c_o', 'a', 's', 'r', 'w', 'K', 'Y', 'z')
 
 
 def compute_prices(k, par: Parameters):
@@ -152,7 +160,90 @@ def compute_capital_ex_demand(k, par: Parameters):
     return ex_demand
 
 
-def compute_steady_state(par: Parameters):
+def compute_prices_deriv(k, par: Parameters):
+    """
+    Return the derivatives of factor prices with respect to the
+    capital-labor ratio.
+
+    Parameters
+    ----------
+    k : float
+        Capital-labor ratio
+    par : Parameters
+        Parameters for the given problem
+
+    Returns
+    -------
+    dr : float
+        Derivative of the interest rate w.r.t. k
+    dw : float
+        Derivative of the wage rate w.r.t. k
+    """
+
+    dr = par.alpha * (par.alpha - 1) * par.z * k**(par.alpha - 2)
+    dw = par.alpha * (1 - par.alpha) * par.z * k**(par.alpha - 1)
+
+    return dr, dw
+
+
+def compute_savings_rate_deriv(r, par: Parameters):
+    """
+    Return the derivative of the savings rate with respect to the
+    interest rate.
+
+    Parameters
+    ----------
+    r : float
+        Return on capital after depreciation (interest rate)
+    par : Parameters
+        Parameters for the given problem
+
+    Returns
+    -------
+    ds : float
+        Derivative of the savings rate w.r.t. r
+    """
+
+    s = compute_savings_rate(r, par)
+    ds = - s**2 * par.beta**(-1/par.gamma) * (1 - 1/par.gamma) \
+        * (1 + r)**(-1/par.gamma)
+
+    return ds
+
+
+def compute_capital_ex_demand_deriv(k, par: Parameters):
+    """
+    Compute the derivative of the excess demand for capital with respect
+    to the capital-labor ratio.
+
+    Parameters
+    ----------
+    k : float
+        Capital-labor ratio
+    par : Parameters
+        Parameters for the given problem
+
+    Returns
+    -------
+    d_ex_demand : float
+        Derivative of excess demand for capital w.r.t. k
+    """
+
+    # Compute prices and savings rate
+    r, w = compute_prices(k, par)
+    srate = compute_savings_rate(r, par)
+
+    # Derivatives of prices and the savings rate
+    dr, dw = compute_prices_deriv(k, par)
+    ds = compute_savings_rate_deriv(r, par)
+
+    # Derivative of K - s(r) * w * N
+    d_ex_demand = par.N * (1 - ds * dr * w - srate * dw)
+
+    return d_ex_demand
+
+
+def compute_steady_state(par: Parameters, method='auto'):
     """
     Compute the steady-state equilibrium for the OLG model.
 
@@ -160,6 +251,11 @@ def compute_steady_state(par: Parameters):
     ----------
     par : Parameters
         Parameters for the given problem
+    method : str
+        'numerical' uses a root-finder, 'analytic' uses the closed-form
+        solution which requires log utility (gamma = 1). 'auto' uses the
+        closed-form solution whenever gamma = 1. The closed-form solution
+        also works if parameters are arrays.
 
     Returns
     -------
@@ -167,17 +263,25 @@ def compute_steady_state(par: Parameters):
         Steady state equilibrium of the OLG model
     """
 
-    # Find the equilibrium k=K/L with a root-finder. Excess demand for capital
-    # has to be zero in equilibrium.
-    res = root_scalar(
-        compute_capital_ex_demand, bracket=(1.0e-3, 10), args=(par, )
-    )
+    if method == 'auto':
+        method = 'analytic' if np.all(par.gamma == 1) else 'numerical'
+
+    if method == 'analytic':
+        k = compute_capital_analytic(par)
+    else:
+        # Find the equilibrium k=K/L with a root-finder. Excess demand for capital
+        # has to be zero in equilibrium.
+        res = root_scalar(
+            compute_capital_ex_demand, bracket=(1.0e-3, 10), args=(par, )
+        )
 
-    if not res.converged:
-        print('Equilibrium root-finder did not terminate successfully')
+        if not res.converged:
+            print('Equilibrium root-finder did not terminate successfully')
+
+        k = res.root
 
     # Equilibrium K
-    K = res.root * par.N
+    K = k * par.N
 
     # Create instance of equilibrium class
     eq = SteadyState(par=par, K=K, L=par.N)
@@ -200,11 +304,39 @@ def compute_steady_state(par: Parameters):
     # Aggregate consumption
     C = par.N * (eq.c_y + eq.c_o)
     # Check that goods market clearing holds using Y = C + I
-    assert abs(eq.Y - C - eq.I) < 1.0e-8
+    assert np.all(np.abs(eq.Y - C - eq.I) < 1.0e-8)
 
     return eq
 
 
+def compute_capital_analytic(par: Parameters):
+    """
+    Return the steady-state capital-labor ratio for log utility.
+
+    With gamma = 1, the savings rate s = beta/(1+beta) does not depend on the
+    interest rate, and k = s * w(k) can be solved for k in closed form for
+    any depreciation rate.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem (may contain arrays)
+
+    Returns
+    -------
+    k : float or array
+        Steady-state capital-labor ratio
+    """
+
+    if not np.all(par.gamma == 1):
+        raise ValueError('Closed-form solution requires log utility')
+
+    s = par.beta / (1 + par.beta)
+    k = (s * (1 - par.alpha) * par.z)**(1 / (1 - par.alpha))
+
+    return k
+
+
 def print_steady_state(eq: SteadyState):
     """
     Print equilibrium prices, allocations, and excess demand.
@@ -235,31 +367,38 @@ def print_steady_state(eq: SteadyState):
     print(f'    Goods market: {(eq.c_y + eq.c_o + eq.a) * N - eq.Y - (1-eq.par.delta) * eq.K:.5e}')
 
 
-def initialize_sim(T, eq: SteadyState = None):
+def initialize_sim(T, eq: SteadyState = None, n_paths=None, filename=None):
     """
     Initialize simulation instance (allocate arrays for time series).
 
+    All time series are stored as rows of one contiguous buffer sim.data,
+    and the attributes sim.c_y, sim.c_o, etc. are views into this buffer.
+
     Parameters
     ----------
     T : int
         Number of periods to simulate
     eq : SteadyState, optional
         Steady-state equilibrium to use for initial period
+    n_paths : int, optional
+        If given, each time series is a (T+1, n_paths) array
+    filename : str, optional
+        If given, the buffer is a memory-mapped .npy file at this location
+        so that the simulation is written to disk instead of kept in RAM.
     """
 
-    # Initialize simulation instance
-    sim = Simulation()
+    # Shape of the buffer
+    shape = (len(SIM_VARIABLES), T+1)
+    if n_paths is not None:
+        shape += (n_paths, )
 
-    # Initialize time series
-    sim.c_y = np.empty(T+1)
-    sim.c_o = np.empty(T+1)
-    sim.a = np.empty(T+1)
-    sim.s = np.empty(T+1)
-    sim.r = np.empty(T+1)
-    sim.w = np.empty(T+1)
-    sim.K = np.empty(T+1)
-    sim.Y = np.empty(T+1)
-    sim.z = np.empty(T+1)
+    if filename is None:
+        data = np.empty(shape)
+    else:
+        data = np.lib.format.open_memmap(filename, mode='w+', dtype=float, shape=shape)
+
+    # Initialize simulation instance with views into buffer
+    sim = simulation_from_buffer(data)
 
     if eq is not None:
         # Set initial values to steady-state values
@@ -276,18 +415,101 @@ def initialize_sim(T, eq: SteadyState = None):
     return sim
 
 
-def simulate_olg(z_new, eq: SteadyState, T = 10):
+def simulation_from_buffer(data):
+    """
+    Create simulation instance whose time series are views into a buffer.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        Buffer with one row for each variable in SIM_VARIABLES
+
+    Returns
+    -------
+    sim : Simulation
+    """
+
+    sim = Simulation(data=data)
+    for i, name in enumerate(SIM_VARIABLES):
+        setattr(sim, name, data[i])
+
+    return sim
+
+
+def save_simulation(sim: Simulation, filename):
+    """
+    Save simulation results to a .npy file.
+
+    Parameters
+    ----------
+    sim : Simulation
+    filename : str
+    """
+
+    if isinstance(sim.data, np.memmap) and sim.data.filename is not None \
+            and os.path.exists(filename) \
+            and os.path.samefile(sim.data.filename, filename):
+        # Buffer is already backed by this file
+        sim.data.flush()
+    elif sim.data is not None:
+        np.save(filename, sim.data)
+    else:
+        np.save(filename, np.stack([getattr(sim, name) for name in SIM_VARIABLES]))
+
+
+def load_simulation(filename, mmap_mode='r'):
+    """
+    Load simulation results saved with save_simulation().
+
+    The file is memory-mapped by default, so that loading takes constant
+    time and data are only read from disk when accessed.
+
+    Parameters
+    ----------
+    filename : str
+    mmap_mode : str, optional
+        Memory-map mode passed to numpy.load(), or None to read the
+        whole file into memory.
+
+    Returns
+    -------
+    sim : Simulation
+    """
+
+    data = np.load(filename, mmap_mode=mmap_mode)
+
+    return simulation_from_buffer(data)
+
+
+def simulate_olg(z_new, eq: SteadyState, T = 10, fast=False, method='auto', filename=None):
     """
     Simulate the transition dynamics of the OLG model.
 
     Parameters
     ----------
-    z_new : float
-        New level of TFP after the shock.
+    z_new : float or array
+        New level of TFP after the shock, or path of TFP for periods 1,...,T.
     eq : SteadyState
         Initial steady-state equilibrium before the shock.
     T : int
         Number of periods to simulate.
+    fast : bool
+        If True, only iterate on the capital stock period by period, compute
+        all other time series in one vectorized step, and check market
+        clearing for the whole path at the end. Selects the numerical
+        method for log utility and cannot be combined with
+        method='analytic'. The solver for general CRRA utility is always
+        vectorized.
+    method : str
+        'numerical' iterates on the law of motion for capital period by
+        period, 'analytic' computes the path of log capital in closed form
+        which requires log utility (gamma = 1). 'auto' uses the closed-form
+        solution whenever gamma = 1, unless fast is True. Only the numerical
+        method without fast checks market clearing in every period, the
+        other methods check it for the whole path at the end.
+    filename : str, optional
+        If given, store the simulation in a memory-mapped .npy file at this
+        location instead of keeping it in RAM.
 
     Returns
     -------
@@ -298,12 +520,18 @@ def simulate_olg(z_new, eq: SteadyState, T = 10):
     # Retrieve parameter object attached to steady-state equilibrium
     par = eq.par
 
-    # The following code only works for log utility
+    # The following code only works for log utility, otherwise solve for 
+    # the whole transition path at once
     if par.gamma != 1:
-        raise ValueError('Simulation only implemented for log utility')
+        return solve_transition(z_new, eq, T, filename=filename)
     
+    if method == 'auto':
+        method = 'numerical' if fast else 'analytic'
+    elif method == 'analytic' and fast:
+        raise ValueError('Fast simulation requires the numerical method')
+
     # Initialize simulation instance and allocate arrays
-    sim = initialize_sim(T, eq)
+    sim = initialize_sim(T, eq, filename=filename)
 
     # TFP is assumed to be at new level for all remaining periods
     sim.z[1:] = z_new
@@ -315,6 +543,12 @@ def simulate_olg(z_new, eq: SteadyState, T = 10):
     s = par.beta / (1 + par.beta)
     sim.s[:] = s
 
+    if method == 'analytic':
+        return _simulate_olg_analytic(sim, s, par)
+
+    if fast:
+        return _simulate_olg_fast(sim, s, par)
+
     for t in range(1, T+1):
         # Update TFP with current value
         par_.z = sim.z[t]
@@ -342,23 +576,303 @@ def simulate_olg(z_new, eq: SteadyState, T = 10):
     return sim
 
 
-def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
+def _simulate_olg_fast(sim: Simulation, s, par: Parameters):
     """
-    Plot the selected simulated time series of the OLG model.
+    Fast path of simulate_olg() for log utility.
+
+    Parameters
+    ----------
+    sim : Simulation
+        Simulation with initial period and TFP path already set.
+    s : float
+        Savings rate
+    par : Parameters
+
+    Returns
+    -------
+    sim : Simulation
+    """
+
+    # Iterate on capital using plain floats:
+    #   K_{t+1} = N * s * w_t = N * s * (1-alpha) * z_t * (K_t/N)^alpha
+    z = sim.z.tolist()
+    K = [sim.a[0] * par.N]
+    coef = par.N * s * (1 - par.alpha)
+    for t in range(1, len(z) - 1):
+        K.append(coef * z[t] * (K[-1] / par.N)**par.alpha)
+    sim.K[1:] = K
+
+    return _complete_simulation(sim, s, par)
+
+
+def _simulate_olg_analytic(sim: Simulation, s, par: Parameters):
+    """
+    Closed-form path of simulate_olg() for log utility.
+
+    Log capital follows the linear difference equation
+        log k_{t+1} = log(s * (1-alpha)) + log z_t + alpha * log k_t
+    which is solved for all periods at once as a linear filter.
+
+    Parameters
+    ----------
+    sim : Simulation
+        Simulation with initial period and TFP path already set.
+    s : float
+        Savings rate
+    par : Parameters
+
+    Returns
+    -------
+    sim : Simulation
+    """
+
+    # Nothing to simulate beyond the initial period
+    if len(sim.K) == 1:
+        return sim
+
+    # Capital in period 1 is predetermined by savings in period 0
+    log_k1 = np.log(sim.a[0])
+
+    # Inputs to the difference equation for k_2,...,k_T
+    u = np.log(s * (1 - par.alpha)) + np.log(sim.z[1:-1])
+    log_k, _ = lfilter([1.0], [1.0, -par.alpha], u, zi=[par.alpha * log_k1])
+
+    sim.K[1] = sim.a[0] * par.N
+    sim.K[2:] = np.exp(log_k) * par.N
+
+    return _complete_simulation(sim, s, par)
+
+
+def _complete_simulation(sim: Simulation, s, par: Parameters):
+    """
+    Compute all remaining time series for log utility from the path of
+    capital and TFP, and check market clearing.
+    """
+
+    # Remaining time series for periods 1,...,T in one step
+    par_ = copy.copy(par)
+    par_.z = sim.z[1:]
+    sim.r[1:], sim.w[1:] = compute_prices(sim.K[1:] / par.N, par_)
+    sim.a[1:] = s * sim.w[1:]
+    sim.c_y[1:] = (1 - s) * sim.w[1:]
+    sim.c_o[1:] = (1 + sim.r[1:]) * sim.a[:-1]
+    sim.Y[1:] = sim.z[1:] * sim.K[1:]**par.alpha * par.N**(1-par.alpha)
+
+    # Verify that goods and capital markets clear in all periods
+    goods, capital = check_market_clearing(sim, par)
+    if goods >= 1.0e-8 or capital >= 1.0e-8:
+        print('Market clearing violated in simulation:')
+        print(f'  Max. goods market residual: {goods:.5e}')
+        print(f'  Max. capital market residual: {capital:.5e}')
+
+    return sim
+
+
+def check_market_clearing(sim: Simulation, par: Parameters):
+    """
+    Compute the largest market-clearing residuals along a simulated path.
+
+    Parameters
+    ----------
+    sim : Simulation
+    par : Parameters
+
+    Returns
+    -------
+    goods : float
+        Max. absolute residual of goods market clearing
+        N * (c_y + c_o + a) = Y + (1-delta) * K
+    capital : float
+        Max. absolute residual of capital market clearing K_t = N * a_{t-1}
+    """
+
+    demand = par.N * (sim.c_y + sim.c_o + sim.a)
+    supply = sim.Y + (1 - par.delta) * sim.K
+    goods = np.max(np.abs(demand - supply))
+
+    capital = np.max(np.abs(sim.K[1:] - par.N * sim.a[:-1]), initial=0.0)
+
+    return goods, capital
+
+
+def solve_transition(z_new, eq: SteadyState, T=10, tol=1.0e-10, maxiter=50, filename=None):
+    """
+    Compute the perfect-foresight transition path of the OLG model for 
+    general CRRA utility.
+
+    The capital stocks K_2,...,K_{T+1} are solved for jointly as one system of
+    nonlinear equations
+        K_{t+1} = N * s(r_{t+1}) * w_t,     t = 1,...,T
+    using Newton's method. Since each equation only depends on K_t and K_{t+1},
+    the Jacobian is lower bidiagonal and each Newton step is a banded solve.
+    TFP is assumed to remain at its period-T value after the last period.
 
     Parameters
     ----------
+    z_new : float or array
+        New level of TFP after the shock, or path of TFP for periods 1,...,T.
     eq : SteadyState
-        The equilibrium containing the initial steady state parameters.
+        Initial steady-state equilibrium before the shock.
+    T : int
+        Number of periods to simulate.
+    tol : float
+        Tolerance for the maximum absolute residual.
+    maxiter : int
+        Maximum number of Newton iterations.
+    filename : str, optional
+        If given, store the simulation in a memory-mapped .npy file at this
+        location instead of keeping it in RAM.
+
+    Returns
+    -------
     sim : Simulation
-        The simulation containing the time series data.
-    eq_new : SteadyState, optional
-        The equilibrium containing the new steady state parameters.
+        Simulation object containing the time series for each variable.
+    """
+
+    # Retrieve parameter object attached to steady-state equilibrium
+    par = eq.par
+
+    # Initialize simulation instance and allocate arrays
+    sim = initialize_sim(T, eq, filename=filename)
+
+    # TFP is assumed to be at new level for all remaining periods
+    sim.z[1:] = z_new
+
+    # Nothing to solve for beyond the initial period
+    if T == 0:
+        return sim
+
+    # Parameters with TFP in periods 1,...,T (z_t) and 2,...,T+1 (z_{t+1})
+    par_t = copy.copy(par)
+    par_t.z = sim.z[1:]
+    par_next = copy.copy(par)
+    par_next.z = np.append(sim.z[2:], sim.z[-1])
+
+    # Capital in period 1 is predetermined by savings in initial steady state
+    K1 = eq.a * par.N
+
+    def residual(K_next):
+        # Capital stocks in periods t = 1,...,T
+        K = np.append(K1, K_next[:-1])
+        # Wages in t and interest rates in t+1
+        w = compute_prices(K / par.N, par_t)[1]
+        r_next = compute_prices(K_next / par.N, par_next)[0]
+        s = compute_savings_rate(r_next, par_next)
+        return K_next - par.N * s * w, K, w, r_next
+
+    # Initial guess: capital stays at initial steady-state level
+    K_next = np.full(T, K1)
+
+    F, K, w, r_next = residual(K_next)
+
+    for it in range(maxiter):
+        if np.max(np.abs(F)) < tol:
+            break
+
+        # Jacobian: diagonal (w.r.t. K_{t+1}) and subdiagonal (w.r.t. K_t)
+        s = compute_savings_rate(r_next, par_next)
+        ds = compute_savings_rate_deriv(r_next, par_next)
+        dr_next = compute_prices_deriv(K_next / par.N, par_next)[0] / par.N
+        dw = compute_prices_deriv(K / par.N, par_t)[1] / par.N
+
+        ab = np.zeros((2, T))
+        ab[0] = 1 - par.N * ds * dr_next * w
+        ab[1, :-1] = - par.N * s[1:] * dw[1:]
+
+        # Newton step
+        step = solve_banded((1, 0), ab, -F)
+
+        # Backtrack if step does not reduce residual or leads to K <= 0
+        norm = np.max(np.abs(F))
+        lam = 1.0
+        while True:
+            K_try = K_next + lam * step
+            if np.all(K_try > 0):
+                F_try, K_, w_, r_ = residual(K_try)
+                if np.max(np.abs(F_try)) < norm or lam < 1.0e-8:
+                    break
+            lam /= 2
+
+        K_next = K_try
+        F, K, w, r_next = F_try, K_, w_, r_
+
+    # Check residual after the last update (which may have converged)
+    if np.max(np.abs(F)) >= tol:
+        print('Transition path solver did not terminate successfully')
+
+    # Store time series for periods t = 1,...,T
+    sim.K[1:] = K
+    sim.r[1:], sim.w[1:] = compute_prices(K / par.N, par_t)
+    sim.a[1:] = K_next / par.N
+    sim.s[1:] = sim.a[1:] / sim.w[1:]
+    sim.c_y[1:] = sim.w[1:] - sim.a[1:]
+    sim.c_o[1:] = (1 + sim.r[1:]) * sim.a[:-1]
+    sim.Y[1:] = sim.z[1:] * K**par.alpha * par.N**(1-par.alpha)
+
+    # Verify that goods market clearing holds
+    goods, capital = check_market_clearing(sim, par)
+    assert goods < 1.0e-8
+
+    return sim
+
+
+def check_analytic_solution(par: Parameters, z_new, T=10):
+    """
+    Compare the closed-form and numerical solutions for log utility.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem (with gamma = 1)
+    z_new : float or array
+        New level of TFP after the shock, or path of TFP for periods 1,...,T.
+    T : int
+        Number of periods to simulate.
+
+    Returns
+    -------
+    diff_eq : float
+        Max. absolute difference in steady-state capital
+    diff_sim : float
+        Max. absolute difference across all simulated time series
+    """
+
+    eq_num = compute_steady_state(par, method='numerical')
+    eq = compute_steady_state(par, method='analytic')
+    diff_eq = abs(eq.K - eq_num.K)
+
+    # Simulate from the same initial steady state
+    sim_num = simulate_olg(z_new, eq, T, method='numerical')
+    sim = simulate_olg(z_new, eq, T, method='analytic')
+    diff_sim = np.max(np.abs(sim.data - sim_num.data))
+
+    return diff_eq, diff_sim
+
+
+def create_simulation_figure(eq_new=False, deviations=True, marker=None):
+    """
+    Create a figure with empty artists for plotting simulated time series
+    of the OLG model.
+
+    The returned figure can be reused for several simulations by passing it
+    to update_simulation_figure().
+
+    Parameters
+    ----------
+    eq_new : bool
+        If True, add horizontal lines for a new steady state.
     deviations : bool
-        If True, plot deviations from the initial steady state instead
-        of absolute values.
-    filename : str, optional
-        If provided, save the figure to this location.
+        If True, the figure shows deviations from the initial steady state
+        instead of absolute values.
+    marker : str, optional
+        Marker used for time series.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+    artists : dict
+        Tuple (line, initial SS line, new SS line or None) for each plotted
+        variable.
     """
 
     fig, axes = plt.subplots(
@@ -367,7 +881,7 @@ def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
 
     # Keyword arguments for time series plots
     kwargs = {
-        'marker': 'o' if len(sim.K) < 30 else None,
+        'marker': marker,
         'markersize': 4,
         'color': 'steelblue',
     }
@@ -377,7 +891,7 @@ def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
         'color': 'black',
         'linewidth': 0.5,
         'linestyle': '--',
-        'label': 'Steady state' if eq_new is None else 'Initial steady state'
+        'label': 'Initial steady state' if eq_new else 'Steady state'
     }
 
     # Keyword arguments for horizontal lines indicating new steady state
@@ -388,70 +902,33 @@ def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
         'label': 'New steady state'
     }
 
-    if eq_new is not None:
+    if eq_new:
         ylabel = "Deviation from initial SS" if deviations else None
     else:
         ylabel = "Deviation from SS" if deviations else None
 
-    # Plot TFP time series
-    yvalues = sim.z / eq.par.z - 1 if deviations else sim.z
-    axes[0, 0].plot(yvalues, label="Time series", **kwargs)
-    # Horizontal line at old steady state
-    yvalues = 0 if deviations else eq.par.z
-    axes[0, 0].axhline(yvalues, **kwargs_init)
-    # Horizontal line at new steady state
-    if eq_new is not None:
-        yvalues = eq_new.par.z / eq.par.z - 1 if deviations else eq_new.par.z
-        axes[0, 0].axhline(yvalues, **kwargs_new)
+    # Axes and titles for each plotted variable
+    titles = {
+        'z': (axes[0, 0], "TFP $z$"),
+        'Y': (axes[0, 1], "Output $Y$"),
+        'K': (axes[1, 0], "Capital $K$"),
+        'w': (axes[1, 1], "Wage $w$"),
+        'r': (axes[2, 0], "Interest rate $r$"),
+    }
+
+    artists = {}
+    for name, (ax, title) in titles.items():
+        line, = ax.plot([], [], label="Time series", **kwargs)
+        # Horizontal line at old steady state
+        line_init = ax.axhline(0, **kwargs_init)
+        # Horizontal line at new steady state
+        line_new = ax.axhline(0, **kwargs_new) if eq_new else None
+        ax.set_title(title)
+        artists[name] = (line, line_init, line_new)
+
     axes[0, 0].set_ylabel(ylabel)
-    axes[0, 0].set_title("TFP $z$")
-
-    # Plot output time series
-    yvalues = sim.Y / eq.Y - 1 if deviations else sim.Y
-    axes[0, 1].plot(yvalues, **kwargs)
-    # Horizontal line at old steady state
-    yvalues = 0 if deviations else eq.Y
-    axes[0, 1].axhline(yvalues, **kwargs_init)
-    # Horizontal line at new steady state
-    if eq_new is not None:
-        yvalues = eq_new.Y / eq.Y - 1 if deviations else eq_new.Y
-        axes[0, 1].axhline(yvalues, **kwargs_new)
-    axes[0, 1].set_title("Output $Y$")
-
-    # Plot capital time series
-    yvalues = sim.K / eq.K - 1 if deviations else sim.K
-    axes[1, 0].plot(yvalues, **kwargs)
-    # Horizontal line at old steady state
-    yvalues = 0 if deviations else eq.K
-    axes[1, 0].axhline(yvalues, **kwargs_init)
-    # Horizontal line at new steady state
-    if eq_new is not None:
-        yvalues = eq_new.K / eq.K - 1 if deviations else eq_new.K
-        axes[1, 0].axhline(yvalues, **kwargs_new)
-    axes[1, 0].set_title("Capital $K$")
     axes[1, 0].set_ylabel(ylabel)
-
-    # Plot wage time series
-    yvalues = sim.w / eq.w - 1 if deviations else sim.w
-    axes[1, 1].plot(yvalues, **kwargs)
-    # Horizontal line at old steady state
-    yvalues = 0 if deviations else eq.w
-    axes[1, 1].axhline(yvalues, **kwargs_init)
-    # Horizontal line at new steady state
-    if eq_new is not None:
-        yvalues = eq_new.w / eq.w - 1 if deviations else eq_new.w
-        axes[1, 1].axhline(yvalues, **kwargs_new)
-    axes[1, 1].set_title("Wage $w$")
-
-    # Plot interest rate time series
-    axes[2, 0].plot(sim.r, **kwargs)
-    # Horizontal line at old steady state
-    axes[2, 0].axhline(eq.r, **kwargs_init)
-    # Horizontal line at new steady state
-    if eq_new is not None:
-        axes[2, 0].axhline(eq_new.r, **kwargs_new)
     axes[2, 0].set_xlabel("Period")
-    axes[2, 0].set_title("Interest rate $r$")
     axes[2, 0].yaxis.set_major_formatter(PercentFormatter(xmax=1, decimals=0))
 
     # Turn off last subplot
@@ -465,6 +942,82 @@ def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
             ax.set_ylim((-0.2,0.02))
 
     axes[0, 0].legend()
+
+    return fig, artists
+
+
+def update_simulation_figure(artists, eq, sim, eq_new=None, deviations=True):
+    """
+    Update the artists of a figure created by create_simulation_figure()
+    with the data of a simulation.
+
+    Parameters
+    ----------
+    artists : dict
+        Artists returned by create_simulation_figure().
+    eq : SteadyState
+        The equilibrium containing the initial steady state parameters.
+    sim : Simulation
+        The simulation containing the time series data.
+    eq_new : SteadyState, optional
+        The equilibrium containing the new steady state parameters.
+    deviations : bool
+        If True, plot deviations from the initial steady state instead
+        of absolute values.
+    """
+
+    # Time series and steady-state values (TFP is a parameter)
+    values = {
+        'z': (sim.z, eq.par.z, None if eq_new is None else eq_new.par.z),
+        'Y': (sim.Y, eq.Y, None if eq_new is None else eq_new.Y),
+        'K': (sim.K, eq.K, None if eq_new is None else eq_new.K),
+        'w': (sim.w, eq.w, None if eq_new is None else eq_new.w),
+        'r': (sim.r, eq.r, None if eq_new is None else eq_new.r),
+    }
+
+    for name, (x, x_init, x_new) in values.items():
+        line, line_init, line_new = artists[name]
+
+        # Interest rate is always plotted in levels
+        if deviations and name != 'r':
+            x = x / x_init - 1
+            if x_new is not None:
+                x_new = x_new / x_init - 1
+            x_init = 0
+
+        line.set_data(np.arange(len(x)), x)
+        line_init.set_ydata([x_init, x_init])
+        if line_new is not None:
+            line_new.set_ydata([x_new, x_new])
+
+        ax = line.axes
+        ax.relim()
+        ax.autoscale_view()
+
+
+def plot_simulation(eq, sim, eq_new = None, deviations=True, filename=None):
+    """
+    Plot the selected simulated time series of the OLG model.
+
+    Parameters
+    ----------
+    eq : SteadyState
+        The equilibrium containing the initial steady state parameters.
+    sim : Simulation
+        The simulation containing the time series data.
+    eq_new : SteadyState, optional
+        The equilibrium containing the new steady state parameters.
+    deviations : bool
+        If True, plot deviations from the initial steady state instead
+        of absolute values.
+    filename : str, optional
+        If provided, save the figure to this location.
+    """
+
+    fig, artists = create_simulation_figure(
+        eq_new is not None, deviations, marker='o' if len(sim.K) < 30 else None
+    )
+    update_simulation_figure(artists, eq, sim, eq_new, deviations)
     fig.tight_layout()
 
     # Optionally save the figure
@@ -503,3 +1056,8 @@ if __name__ == '__main__':
 
     # Plot simulation results
     plot_simulation(eq_init, sim, eq_new)
+
+    # Compare closed-form and numerical solutions for log utility
+    diff_eq, diff_sim = check_analytic_solution(par, z_new, T=T)
+    print(f'Closed-form vs. numerical solution: steady state {diff_eq:.3e}, '
+          f'simulation {diff_sim:.3e}')
@@ -0,0 +1,326 @@
+"""
+Lecture 7: Batched steady states of the OLG model
+
+This module solves the steady-state equilibrium of the OLG model for many
+parameter vectors at once. Parameters are stored as a struct of arrays,
+and the excess demand for capital is solved for all parameter vectors
+simultaneously using a vectorized Newton/bisection hybrid.
+"""
+
+import numpy as np
+from dataclasses import dataclass, fields, astuple
+
+from lecture07_olg import (
+    Parameters, SteadyState, compute_prices, compute_savings_rate,
+    compute_capital_ex_demand, compute_capital_ex_demand_deriv
+)
+
+
+@dataclass
+class ParametersBatch:
+    """
+    Parameters for a batch of OLG models (struct of arrays).
+
+    Each attribute is broadcast to a common shape on creation, so scalar
+    values are shared by all models in the batch.
+    """
+    alpha: np.ndarray = Parameters.alpha    # Capital share in production function
+    delta: np.ndarray = Parameters.delta    # Depreciation rate
+    z: np.ndarray = Parameters.z            # TFP
+    beta: np.ndarray = Parameters.beta      # Discount factor
+    gamma: np.ndarray = Parameters.gamma    # RRA in utility
+    N: np.ndarray = Parameters.N            # Number of households per cohort
+
+    def __post_init__(self):
+        # Broadcast all parameters to a common shape
+        names = [f.name for f in fields(self)]
+        values = np.broadcast_arrays(*[np.asarray(v) for v in astuple(self)])
+        for name, value in zip(names, values):
+            setattr(self, name, np.array(value))
+
+
+@dataclass
+class SteadyStateBatch:
+    """
+    Steady-state equilibria for a batch of OLG models (struct of arrays).
+    """
+    par: ParametersBatch = None     # Parameters used to compute equilibria
+    c_y: np.ndarray = None          # Consumption when young
+    c_o: np.ndarray = None          # Consumption when old
+    a: np.ndarray = None            # Savings when young
+    s: np.ndarray = None            # Savings rate when young
+    r: np.ndarray = None            # Interest rate (return on capital)
+    w: np.ndarray = None            # Wage rate
+    K: np.ndarray = None            # Aggregate capital stock
+    L: np.ndarray = None            # Aggregate labor demand
+    I: np.ndarray = None            # Aggregate investment
+    Y: np.ndarray = None            # Aggregate output
+    converged: np.ndarray = None    # True if root-finder converged
+
+
+def stack_parameters(pars):
+    """
+    Combine a sequence of Parameters instances into a batch.
+
+    Parameters
+    ----------
+    pars : sequence of Parameters
+
+    Returns
+    -------
+    par : ParametersBatch
+    """
+
+    names = [f.name for f in fields(Parameters)]
+    values = {
+        name: np.array([getattr(p, name) for p in pars]) for name in names
+    }
+
+    par = ParametersBatch(**values)
+
+    return par
+
+
+def get_parameters(par: ParametersBatch, i):
+    """
+    Return the parameters of a single model in the batch.
+
+    Parameters
+    ----------
+    par : ParametersBatch
+    i : int or tuple
+        Index of the model in the batch
+
+    Returns
+    -------
+    Parameters
+    """
+
+    values = {f.name: getattr(par, f.name)[i].item() for f in fields(Parameters)}
+
+    return Parameters(**values)
+
+
+def get_steady_state(eq: SteadyStateBatch, i):
+    """
+    Return the steady state of a single model in the batch.
+
+    Parameters
+    ----------
+    eq : SteadyStateBatch
+    i : int or tuple
+        Index of the model in the batch
+
+    Returns
+    -------
+    SteadyState
+    """
+
+    values = {
+        f.name: getattr(eq, f.name)[i].item()
+        for f in fields(SteadyState) if f.name != 'par'
+    }
+
+    return SteadyState(par=get_parameters(eq.par, i), **values)
+
+
+def solve_capital_ex_demand(par, lo=1.0e-3, hi=10.0, k0=None, xtol=1.0e-12,
+                            rtol=1.0e-12, maxiter=100):
+    """
+    Find the roots of the excess demand for capital for all models in the
+    batch using a safeguarded Newton method.
+
+    Newton steps are taken whenever they remain inside the current bracket,
+    otherwise the bracket is bisected.
+
+    Parameters
+    ----------
+    par : Parameters or ParametersBatch
+        Parameters for the given problem(s)
+    lo : float or array
+        Lower end of bracket for capital-labor ratio
+    hi : float or array
+        Upper end of bracket for capital-labor ratio
+    k0 : float or array, optional
+        Initial guess. Defaults to the midpoint of the bracket.
+    xtol : float
+        Absolute tolerance on the root
+    rtol : float
+        Relative tolerance on the root
+    maxiter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    k : numpy.ndarray
+        Capital-labor ratio which sets excess demand to zero. NaN for
+        models without a sign change in the bracket.
+    converged : numpy.ndarray
+        Boolean array, True if the root-finder converged
+    """
+
+    # Broadcast bracket to common shape of all parameters
+    shape = np.broadcast_shapes(
+        np.shape(lo), np.shape(hi), *[np.shape(v) for v in vars(par).values()]
+    )
+    lo = np.array(np.broadcast_to(lo, shape), dtype=float)
+    hi = np.array(np.broadcast_to(hi, shape), dtype=float)
+
+    f_lo = compute_capital_ex_demand(lo, par)
+    f_hi = compute_capital_ex_demand(hi, par)
+
+    # Models with a valid bracket
+    valid = np.sign(f_lo) != np.sign(f_hi)
+
+    # Initial guess, must be strictly inside bracket
+    k = 0.5 * (lo + hi)
+    if k0 is not None:
+        k0 = np.broadcast_to(k0, shape)
+        inside = (k0 > np.minimum(lo, hi)) & (k0 < np.maximum(lo, hi))
+        k = np.where(inside, k0, k)
+
+    converged = ~valid
+
+    for it in range(maxiter):
+        f = compute_capital_ex_demand(k, par)
+        df = compute_capital_ex_demand_deriv(k, par)
+
+        # Shrink bracket: replace the end with the same sign as f
+        same_lo = np.sign(f) == np.sign(f_lo)
+        lo = np.where(same_lo, k, lo)
+        f_lo = np.where(same_lo, f, f_lo)
+        hi = np.where(same_lo, hi, k)
+
+        # Newton step
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dk = f / df
+        k_new = k - dk
+
+        # Models for which the Newton step is below tolerance
+        done = (f == 0) | (np.abs(dk) <= xtol + rtol * np.abs(k))
+
+        # Replace Newton step by bisection if it leaves the bracket
+        inside = (k_new > np.minimum(lo, hi)) & (k_new < np.maximum(lo, hi))
+        k_new = np.where(inside | done, k_new, 0.5 * (lo + hi))
+
+        # Do not update models which have already converged
+        k = np.where(converged, k, k_new)
+        converged |= done
+
+        if np.all(converged):
+            break
+
+    converged &= valid
+    k = np.where(valid, k, np.nan)
+
+    return k, converged
+
+
+def compute_steady_state_from_capital(k, par: ParametersBatch, converged=None):
+    """
+    Compute the steady-state allocations and prices for given equilibrium
+    capital-labor ratios.
+
+    Parameters
+    ----------
+    k : numpy.ndarray
+        Equilibrium capital-labor ratios
+    par : ParametersBatch
+        Parameters for the given problems
+    converged : numpy.ndarray, optional
+        Boolean array, True if the root-finder converged for a model.
+        Defaults to all True.
+
+    Returns
+    -------
+    eq : SteadyStateBatch
+        Steady-state equilibria of the OLG models
+    """
+
+    if converged is None:
+        converged = np.ones(np.shape(k), dtype=bool)
+
+    # Equilibrium K
+    K = k * par.N
+
+    # Create instance of equilibrium class
+    eq = SteadyStateBatch(par=par, K=K, L=par.N * np.ones_like(K), converged=converged)
+
+    # Equilibrium prices
+    eq.r, eq.w = compute_prices(eq.K / eq.L, par)
+
+    # Investment in steady state
+    eq.I = eq.K * par.delta
+
+    # Equilibrium household choices
+    eq.s = compute_savings_rate(eq.r, par)
+    eq.a = eq.s * eq.w
+    eq.c_y = eq.w - eq.a
+    eq.c_o = (1 + eq.r) * eq.a
+
+    # Equilibrium output
+    eq.Y = par.z * eq.K**par.alpha * eq.L**(1-par.alpha)
+
+    # Aggregate consumption
+    C = par.N * (eq.c_y + eq.c_o)
+    # Check that goods market clearing holds using Y = C + I
+    assert np.all(np.abs(eq.Y - C - eq.I)[converged] < 1.0e-8)
+
+    return eq
+
+
+def compute_steady_state_batch(par):
+    """
+    Compute the steady-state equilibria for a batch of OLG models.
+
+    Parameters
+    ----------
+    par : ParametersBatch or sequence of Parameters
+        Parameters for the given problems
+
+    Returns
+    -------
+    eq : SteadyStateBatch
+        Steady-state equilibria of the OLG models
+    """
+
+    if not isinstance(par, ParametersBatch):
+        par = stack_parameters(par)
+
+    # Initial guess: capital-labor ratio implied by log utility, where
+    # the savings rate is independent of the interest rate
+    s = par.beta / (1 + par.beta)
+    k0 = (s * (1 - par.alpha) * par.z)**(1 / (1 - par.alpha))
+
+    # Find the equilibrium k=K/L for all models at once
+    k, converged = solve_capital_ex_demand(par, k0=k0)
+
+    if not np.all(converged):
+        n = np.sum(~converged)
+        print(f'Equilibrium root-finder did not terminate successfully for {n} models')
+
+    eq = compute_steady_state_from_capital(k, par, converged)
+
+    return eq
+
+
+if __name__ == '__main__':
+
+    import time
+    from lecture07_olg import compute_steady_state
+
+    # Grid of discount factors and RRA parameters
+    beta = np.linspace(0.90, 0.99, 100)**30
+    gamma = np.linspace(1.0, 5.0, 100)
+
+    # Batch of parameters on the Cartesian product of beta and gamma
+    par = ParametersBatch(beta=beta[:, None], gamma=gamma[None, :])
+
+    t0 = time.perf_counter()
+    eq = compute_steady_state_batch(par)
+    t1 = time.perf_counter()
+    print(f'Solved {eq.K.size} steady states in {t1 - t0:.3f} sec.')
+
+    # Compare one model to the scalar solver
+    eq1 = compute_steady_state(get_parameters(par, (10, 20)))
+    print(f'Difference in K vs. scalar solver: {eq.K[10, 20] - eq1.K:.3e}')
@@ -0,0 +1,281 @@
+"""
+Lecture 7: Cache for steady states of the OLG model
+
+This module stores steady states computed by compute_steady_state() so that
+repeated calls with the same parameters do not solve the model again.
+Steady states are looked up by a hash of the parameter values and a solver
+version tag, first in memory (least recently used entries are evicted first)
+and optionally on disk (one .npz file per steady state).
+"""
+
+import os
+import copy
+import hashlib
+from collections import OrderedDict
+from dataclasses import fields
+
+import numpy as np
+
+from lecture07_olg import Parameters, SteadyState, compute_steady_state
+
+
+# Version tag of the steady-state solver. Change this whenever the solver
+# changes so that stale cache entries are no longer used.
+SOLVER_VERSION = '2'
+
+
+def parameters_key(par: Parameters, version=SOLVER_VERSION):
+    """
+    Return a key which uniquely identifies the parameter values.
+
+    Parameters
+    ----------
+    par : Parameters
+    version : str
+        Solver version tag
+
+    Returns
+    -------
+    str
+        Hex digest of the SHA-256 hash of the parameter values.
+    """
+
+    # repr() of a float is exact, so different values give different keys
+    items = [f'{f.name}={float(getattr(par, f.name))!r}' for f in fields(par)]
+    text = ';'.join([f'version={version}'] + items)
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def save_steady_state(eq: SteadyState, filename):
+    """
+    Save a steady state (including its parameters) to a .npz file.
+
+    Parameters
+    ----------
+    eq : SteadyState
+    filename : str
+    """
+
+    values = {
+        f'par.{f.name}': getattr(eq.par, f.name) for f in fields(eq.par)
+    }
+    values.update({
+        f.name: getattr(eq, f.name) for f in fields(eq) if f.name != 'par'
+    })
+
+    # Write to temporary file first so that other processes never read
+    # partially written files
+    tmpfile = f'{filename}.{os.getpid()}.tmp'
+    with open(tmpfile, 'wb') as f:
+        np.savez(f, **values)
+    os.replace(tmpfile, filename)
+
+
+def load_steady_state(filename):
+    """
+    Load a steady state saved with save_steady_state().
+
+    Parameters
+    ----------
+    filename : str
+
+    Returns
+    -------
+    eq : SteadyState
+    """
+
+    with np.load(filename) as data:
+        par = Parameters(**{
+            f.name: data[f'par.{f.name}'].item() for f in fields(Parameters)
+        })
+        eq = SteadyState(par=par, **{
+            f.name: data[f.name].item()
+            for f in fields(SteadyState) if f.name != 'par'
+        })
+
+    return eq
+
+
+class SteadyStateCache:
+    """
+    Two-tier cache for steady states: an in-memory LRU cache and an optional
+    directory with one .npz file per steady state.
+    """
+
+    def __init__(self, maxsize=128, directory=None, max_files=10_000,
+                 version=SOLVER_VERSION):
+        """
+        Parameters
+        ----------
+        maxsize : int
+            Maximum number of steady states kept in memory.
+        directory : str, optional
+            Directory for the on-disk cache. No disk cache is used if None.
+        max_files : int
+            Maximum number of steady states kept on disk.
+        version : str
+            Solver version tag which is part of the key.
+        """
+
+        self.maxsize = maxsize
+        self.directory = directory
+        self.max_files = max_files
+        self.version = version
+
+        self.memory = OrderedDict()
+
+        # Keys of steady states on disk, least recently used first. The
+        # directory is scanned once here, so that eviction does not need to
+        # list the directory on every call to put().
+        self.files = OrderedDict()
+
+        # Hit and miss counters
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            files = [f for f in os.listdir(directory) if f.endswith('.npz')]
+            files.sort(key=lambda f: os.path.getmtime(os.path.join(directory, f)))
+            for f in files:
+                self.files[f[:-len('.npz')]] = None
+
+    def _filename(self, key):
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def get(self, par: Parameters):
+        """
+        Return the cached steady state for the given parameters, or None.
+        """
+
+        key = parameters_key(par, self.version)
+
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.memory[key])
+
+        if self.directory is not None:
+            filename = self._filename(key)
+            if os.path.exists(filename):
+                eq = load_steady_state(filename)
+                # Update modification time so that eviction removes the
+                # least recently used files
+                os.utime(filename)
+                self.files[key] = None
+                self.files.move_to_end(key)
+                self._store_memory(key, eq)
+                self.hits += 1
+                self.disk_hits += 1
+                return copy.deepcopy(eq)
+
+        self.misses += 1
+
+        return None
+
+    def put(self, par: Parameters, eq: SteadyState):
+        """
+        Store the steady state for the given parameters.
+        """
+
+        key = parameters_key(par, self.version)
+        eq = copy.deepcopy(eq)
+
+        self._store_memory(key, eq)
+
+        if self.directory is not None:
+            save_steady_state(eq, self._filename(key))
+            self.files[key] = None
+            self.files.move_to_end(key)
+            self._evict_files()
+
+    def _store_memory(self, key, eq):
+        self.memory[key] = eq
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+    def _evict_files(self):
+        # Remove least recently used files first
+        while len(self.files) > self.max_files:
+            key, _ = self.files.popitem(last=False)
+            try:
+                os.remove(self._filename(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """
+        Remove all entries from memory and disk and reset counters.
+        """
+
+        self.memory.clear()
+        self.files.clear()
+        if self.directory is not None:
+            for f in os.listdir(self.directory):
+                if f.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, f))
+
+        self.hits = self.disk_hits = self.misses = 0
+
+
+# Default in-memory cache used by cached_steady_state()
+default_cache = SteadyStateCache()
+
+
+def cached_steady_state(par: Parameters, cache: SteadyStateCache = None):
+    """
+    Compute the steady-state equilibrium, reusing cached results if
+    available.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem
+    cache : SteadyStateCache, optional
+        Cache to use. Defaults to a module-level in-memory cache.
+
+    Returns
+    -------
+    eq : SteadyState
+        Steady state equilibrium of the OLG model
+    """
+
+    if cache is None:
+        cache = default_cache
+
+    eq = cache.get(par)
+
+    if eq is None:
+        eq = compute_steady_state(par)
+        cache.put(par, eq)
+
+    return eq
+
+
+if __name__ == '__main__':
+
+    import time
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SteadyStateCache(maxsize=16, directory=directory)
+
+        par = Parameters(beta=0.5)
+
+        t0 = time.perf_counter()
+        eq = cached_steady_state(par, cache)
+        t1 = time.perf_counter()
+        eq = cached_steady_state(Parameters(beta=0.5), cache)
+        t2 = time.perf_counter()
+
+        print(f'First call: {1000*(t1-t0):.3f} msec, second call: {1000*(t2-t1):.3f} msec')
+
+        # New cache instance using the same directory reads from disk
+        cache2 = SteadyStateCache(directory=directory)
+        eq2 = cached_steady_state(par, cache2)
+        print(f'Read from disk: {eq2 == eq}')
+        print(f'Hits: {cache.hits + cache2.hits}, disk hits: {cache2.disk_hits}, '
+              f'misses: {cache.misses + cache2.misses}')
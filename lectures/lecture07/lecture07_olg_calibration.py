@@ -0,0 +1,305 @@
+"""
+Lecture 7: Calibration of the OLG model
+
+This module calibrates parameters of the OLG model to match target moments
+of the steady state, such as the capital-output ratio or the interest rate.
+Derivatives of steady-state moments with respect to parameters are computed
+analytically using the implicit function theorem applied to the excess
+demand for capital, and the moment conditions are solved with a
+Gauss-Newton method.
+"""
+
+import copy
+import numpy as np
+
+from lecture07_olg import (
+    Parameters, SteadyState, compute_steady_state,
+    compute_prices, compute_prices_deriv, compute_savings_rate, compute_savings_rate_deriv,
+    compute_capital_ex_demand_deriv
+)
+
+
+# Parameters which can be calibrated
+PARAMETERS = ('alpha', 'beta', 'gamma', 'z', 'delta')
+
+# Steady-state moments which can be targeted
+MOMENTS = ('K/Y', 'r', 'w')
+
+
+def compute_prices_param_deriv(k, par: Parameters):
+    """
+    Return the partial derivatives of factor prices with respect to
+    parameters, holding the capital-labor ratio fixed.
+
+    Parameters
+    ----------
+    k : float
+        Capital-labor ratio
+    par : Parameters
+
+    Returns
+    -------
+    dr : dict
+        Derivatives of the interest rate for each parameter in PARAMETERS
+    dw : dict
+        Derivatives of the wage rate for each parameter in PARAMETERS
+    """
+
+    log_k = np.log(k)
+
+    dr = {
+        'alpha': par.z * k**(par.alpha - 1) * (1 + par.alpha * log_k),
+        'beta': 0.0,
+        'gamma': 0.0,
+        'z': par.alpha * k**(par.alpha - 1),
+        'delta': -1.0,
+    }
+
+    dw = {
+        'alpha': par.z * k**par.alpha * ((1 - par.alpha) * log_k - 1),
+        'beta': 0.0,
+        'gamma': 0.0,
+        'z': (1 - par.alpha) * k**par.alpha,
+        'delta': 0.0,
+    }
+
+    return dr, dw
+
+
+def compute_savings_rate_param_deriv(r, par: Parameters):
+    """
+    Return the partial derivatives of the savings rate with respect to
+    parameters, holding the interest rate fixed.
+
+    Parameters
+    ----------
+    r : float
+        Interest rate
+    par : Parameters
+
+    Returns
+    -------
+    ds : dict
+        Derivatives of the savings rate for each parameter in PARAMETERS
+    """
+
+    s = compute_savings_rate(r, par)
+    # Savings rate is s = 1/(1+B) with B = beta^(-1/gamma) * (1+r)^(1-1/gamma)
+    B = 1/s - 1
+
+    ds = {
+        'alpha': 0.0,
+        'beta': s**2 * B / (par.gamma * par.beta),
+        'gamma': - s**2 * B * np.log(par.beta * (1 + r)) / par.gamma**2,
+        'z': 0.0,
+        'delta': 0.0,
+    }
+
+    return ds
+
+
+def compute_moments(eq: SteadyState):
+    """
+    Return steady-state moments which can be targeted.
+
+    Parameters
+    ----------
+    eq : SteadyState
+
+    Returns
+    -------
+    dict
+        Value of each moment in MOMENTS
+    """
+
+    return {'K/Y': eq.K / eq.Y, 'r': eq.r, 'w': eq.w}
+
+
+def compute_capital_param_deriv(k, par: Parameters, params):
+    """
+    Compute the derivatives of the steady-state capital-labor ratio with
+    respect to parameters using the implicit function theorem.
+
+    The equilibrium capital-labor ratio k(theta) satisfies ED(k, theta) = 0,
+    so that dk/dtheta = - ED_theta / ED_k.
+
+    Parameters
+    ----------
+    k : float
+        Steady-state capital-labor ratio
+    par : Parameters
+    params : sequence of str
+        Names of parameters (in PARAMETERS)
+
+    Returns
+    -------
+    k_p : dict
+        Derivative of k w.r.t. each parameter
+    """
+
+    r, w = compute_prices(k, par)
+    s = compute_savings_rate(r, par)
+
+    # Derivatives w.r.t. k
+    s_r = compute_savings_rate_deriv(r, par)
+    ED_k = compute_capital_ex_demand_deriv(k, par)
+
+    # Partial derivatives w.r.t. parameters
+    r_p, w_p = compute_prices_param_deriv(k, par)
+    s_p = compute_savings_rate_param_deriv(r, par)
+
+    k_p = {}
+
+    for p in params:
+        # Excess demand ED = N * (k - s(r, theta) * w)
+        ED_p = - par.N * ((s_r * r_p[p] + s_p[p]) * w + s * w_p[p])
+
+        # Implicit function theorem
+        k_p[p] = - ED_p / ED_k
+
+    return k_p
+
+
+def compute_moments_deriv(eq: SteadyState, params):
+    """
+    Compute the derivatives of steady-state moments with respect to
+    parameters using the implicit function theorem.
+
+    The derivatives of the capital-labor ratio are computed by
+    compute_capital_param_deriv().
+
+    Parameters
+    ----------
+    eq : SteadyState
+    params : sequence of str
+        Names of parameters
+
+    Returns
+    -------
+    jac : dict
+        jac[m][p] contains the derivative of moment m w.r.t. parameter p
+    """
+
+    par = eq.par
+    k = eq.K / eq.L
+
+    # Derivatives w.r.t. k
+    r_k, w_k = compute_prices_deriv(k, par)
+
+    # Partial derivatives of prices w.r.t. parameters
+    r_p, w_p = compute_prices_param_deriv(k, par)
+
+    # Derivatives of k w.r.t. parameters
+    k_p = compute_capital_param_deriv(k, par, params)
+
+    # Capital-output ratio K/Y = k^(1-alpha) / z
+    KY = eq.K / eq.Y
+    KY_k = (1 - par.alpha) * KY / k
+    KY_p = {'alpha': - np.log(k) * KY, 'z': - KY / par.z}
+
+    jac = {m: {} for m in MOMENTS}
+
+    for p in params:
+        jac['K/Y'][p] = KY_k * k_p[p] + KY_p.get(p, 0.0)
+        jac['r'][p] = r_k * k_p[p] + r_p[p]
+        jac['w'][p] = w_k * k_p[p] + w_p[p]
+
+    return jac
+
+
+def calibrate(par: Parameters, targets, params, tol=1.0e-10, maxiter=50):
+    """
+    Calibrate parameters to match target steady-state moments.
+
+    Parameters
+    ----------
+    par : Parameters
+        Initial guess for calibrated parameters and values for all others
+    targets : dict
+        Target value for each targeted moment, e.g. {'K/Y': 3.0, 'r': 0.05}
+    params : sequence of str
+        Names of parameters to calibrate. There must not be more
+        parameters than targets.
+    tol : float
+        Tolerance for the maximum absolute deviation from targets
+    maxiter : int
+        Maximum number of Gauss-Newton iterations
+
+    Returns
+    -------
+    eq : SteadyState
+        Steady state at the calibrated parameters (eq.par)
+    n_evals : int
+        Number of steady states computed
+    """
+
+    names = list(targets.keys())
+    target = np.array([targets[m] for m in names])
+
+    def solve(x):
+        # Compute steady state and deviations from targets, or return None
+        # if parameters are invalid
+        par_ = copy.copy(par)
+        for p, value in zip(params, x):
+            setattr(par_, p, float(value))
+        if not (0 < par_.alpha < 1 and par_.beta > 0 and par_.z > 0):
+            return None, None
+        try:
+            eq = compute_steady_state(par_)
+        except ValueError:
+            return None, None
+        moments = compute_moments(eq)
+        dev = np.array([moments[m] for m in names]) - target
+        return eq, dev
+
+    x = np.array([getattr(par, p) for p in params], dtype=float)
+    eq, dev = solve(x)
+    n_evals = 1
+
+    if eq is None:
+        raise ValueError('Invalid initial guess for calibrated parameters')
+
+    for it in range(maxiter):
+        if np.max(np.abs(dev)) < tol:
+            break
+
+        # Jacobian of moment deviations w.r.t. calibrated parameters
+        jac = compute_moments_deriv(eq, params)
+        J = np.array([[jac[m][p] for p in params] for m in names])
+
+        # Gauss-Newton step
+        step = np.linalg.lstsq(J, -dev, rcond=None)[0]
+
+        # Backtrack if step leads to invalid parameters or larger deviations
+        lam = 1.0
+        while lam > 1.0e-8:
+            eq_new, dev_new = solve(x + lam * step)
+            n_evals += 1
+            if eq_new is not None and np.sum(dev_new**2) < np.sum(dev**2):
+                break
+            lam /= 2
+        else:
+            print('Calibration did not terminate successfully')
+            break
+
+        x = x + lam * step
+        eq, dev = eq_new, dev_new
+    else:
+        print('Calibration did not terminate successfully')
+
+    return eq, n_evals
+
+
+if __name__ == '__main__':
+
+    # Targets: capital-output ratio and interest rate (per 30-year period)
+    targets = {'K/Y': 0.12, 'r': (1.04)**30 - 1}
+
+    eq, n_evals = calibrate(Parameters(), targets, params=('beta', 'alpha'))
+
+    print(f'Calibrated parameters ({n_evals} steady states computed):')
+    print(f'  beta = {eq.par.beta:.5f} ({eq.par.beta**(1/30):.5f} per year)')
+    print(f'  alpha = {eq.par.alpha:.5f}')
+    moments = compute_moments(eq)
+    for m in targets:
+        print(f'  {m}: {moments[m]:.5f} (target {targets[m]:.5f})')
@@ -0,0 +1,399 @@
+"""
+Lecture 7: Overlapping generations with many cohorts
+
+This module generalizes the two-period OLG model to J periods of life where
+    - households work inelastically until retirement, choose consumption
+      in every period of life and die with zero assets, and
+    - firms have a Cobb-Douglas production function using capital and labor.
+
+Household choices follow in closed form from the Euler equations and the
+lifetime budget constraint, and are computed for all ages at once.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from scipy.optimize import root_scalar
+import copy
+
+from lecture07_olg import compute_prices
+
+
+@dataclass
+class Parameters:
+    """
+    Parameters for the OLG model with J cohorts.
+    """
+    J: int = 80             # Number of periods of life
+    J_ret: int = 45         # Age at which households retire
+    alpha: float = 0.36     # Capital share in production function
+    delta: float = 0.08     # Depreciation rate
+    z: float = 1.0          # TFP
+    beta: float = 0.96      # Discount factor (annual)
+    gamma: float = 2.0      # RRA in utility
+    N: int = 1              # Number of households per cohort
+
+
+@dataclass
+class SteadyState:
+    """
+    Steady-state equilibrium of the OLG model with J cohorts.
+    """
+    par: Parameters = None      # Parameters used to compute equilibrium
+    c: np.ndarray = None        # Consumption by age
+    a: np.ndarray = None        # Assets at the beginning of each age
+    r: float = None             # Interest rate (return on capital)
+    w: float = None             # Wage rate
+    K: float = None             # Aggregate capital stock
+    L: float = None             # Aggregate labor supply
+    I: float = None             # Aggregate investment
+    Y: float = None             # Aggregate output
+
+
+@dataclass
+class Simulation:
+    """
+    Container to store simulation results
+    """
+    c: np.ndarray = None        # Consumption by period and age, (T+1, J)
+    a: np.ndarray = None        # Assets by period and age, (T+1, J)
+    r: np.ndarray = None        # Time series for interest rate
+    w: np.ndarray = None        # Time series for wages
+    K: np.ndarray = None        # Time series for aggregate capital stock
+    Y: np.ndarray = None        # Time series for aggregate output
+    z: np.ndarray = None        # Time series for TFP
+
+
+def compute_labor_endowment(par: Parameters):
+    """
+    Return labor endowment by age (one before retirement, zero after).
+
+    Parameters
+    ----------
+    par : Parameters
+
+    Returns
+    -------
+    e : numpy.ndarray
+        Array of length J with labor endowments
+    """
+
+    e = np.zeros(par.J)
+    e[:par.J_ret] = 1.0
+
+    return e
+
+
+def solve_hh(r, w, par: Parameters):
+    """
+    Solve the life-cycle problem of a household born with zero assets
+    facing constant prices.
+
+    Parameters
+    ----------
+    r : float
+        Interest rate
+    w : float
+        Wage rate
+    par : Parameters
+
+    Returns
+    -------
+    c : numpy.ndarray
+        Consumption at ages 0,...,J-1
+    a : numpy.ndarray
+        Assets at the beginning of ages 0,...,J (a[0] = a[J] = 0)
+    """
+
+    j = np.arange(par.J)
+
+    # Labor income by age
+    y = w * compute_labor_endowment(par)
+
+    # Discount factors 1/(1+r)^j
+    disc = (1 + r)**(-j)
+
+    # Consumption growth from the Euler equation
+    growth = (par.beta * (1 + r))**(j / par.gamma)
+
+    # Initial consumption from lifetime budget constraint
+    c0 = np.sum(disc * y) / np.sum(disc * growth)
+    c = c0 * growth
+
+    # Assets from the budget constraint a_{j+1} = (1+r) a_j + y_j - c_j
+    a = np.zeros(par.J + 1)
+    a[1:] = np.cumsum(disc * (y - c)) / disc
+
+    return c, a
+
+
+def compute_capital_ex_demand(k, par: Parameters):
+    """
+    Compute the excess demand for capital.
+
+    Parameters
+    ----------
+    k : float
+        Capital-labor ratio
+    par : Parameters
+
+    Returns
+    -------
+    ex_demand : float
+        Excess demand for capital
+    """
+
+    # Compute prices from firm's FOCs
+    r, w = compute_prices(k, par)
+
+    # Life-cycle asset profile
+    c, a = solve_hh(r, w, par)
+
+    # Aggregate supply of capital by households
+    A = par.N * np.sum(a[:par.J])
+
+    # Aggregate labor supply
+    L = par.N * np.sum(compute_labor_endowment(par))
+
+    # Excess demand for capital
+    ex_demand = k * L - A
+
+    return ex_demand
+
+
+def compute_steady_state(par: Parameters):
+    """
+    Compute the steady-state equilibrium for the OLG model with J cohorts.
+
+    Parameters
+    ----------
+    par : Parameters
+
+    Returns
+    -------
+    eq : SteadyState
+    """
+
+    # Find the equilibrium k=K/L with a root-finder. Excess demand for capital
+    # has to be zero in equilibrium.
+    res = root_scalar(
+        compute_capital_ex_demand, bracket=(1.0e-3, 100), args=(par, )
+    )
+
+    if not res.converged:
+        print('Equilibrium root-finder did not terminate successfully')
+
+    # Aggregate labor supply
+    L = par.N * np.sum(compute_labor_endowment(par))
+
+    # Create instance of equilibrium class
+    eq = SteadyState(par=par, K=res.root * L, L=L)
+
+    # Equilibrium prices
+    eq.r, eq.w = compute_prices(res.root, par)
+
+    # Equilibrium household choices
+    eq.c, eq.a = solve_hh(eq.r, eq.w, par)
+
+    # Investment in steady state
+    eq.I = eq.K * par.delta
+
+    # Equilibrium output
+    eq.Y = par.z * eq.K**par.alpha * eq.L**(1-par.alpha)
+
+    # Check that goods market clearing holds using Y = C + I
+    C = par.N * np.sum(eq.c)
+    assert abs(eq.Y - C - eq.I) < 1.0e-8
+
+    return eq
+
+
+def solve_hh_path(r, w, a_init, age_init, t_init, par: Parameters):
+    """
+    Solve the remaining life-cycle problem for many households at once
+    given paths of prices.
+
+    Each household starts at period t_init with age age_init and assets
+    a_init (before interest), and the sequence of prices is known.
+
+    Parameters
+    ----------
+    r : numpy.ndarray
+        Path of interest rates. Must cover all periods t_init + J - 1.
+    w : numpy.ndarray
+        Path of wages.
+    a_init : numpy.ndarray
+        Initial assets for each household.
+    age_init : numpy.ndarray
+        Initial age for each household.
+    t_init : numpy.ndarray
+        Initial period for each household.
+    par : Parameters
+
+    Returns
+    -------
+    c : numpy.ndarray
+        (n, J) array of consumption by age, zero before the initial age.
+    a : numpy.ndarray
+        (n, J+1) array of assets by age at the beginning of each age.
+    """
+
+    j = np.arange(par.J)[None, :]
+    age_init = np.asarray(age_init)[:, None]
+    t_init = np.asarray(t_init)[:, None]
+    a_init = np.asarray(a_init, dtype=float)[:, None]
+
+    # Remaining life of each household
+    alive = j >= age_init
+
+    # Period in which the household has age j
+    t = np.clip(t_init + j - age_init, 0, len(r) - 1)
+
+    # Gross returns on assets and labor income by age
+    R = np.where(alive, 1 + r[t], 1.0)
+    y = np.where(alive, w[t] * compute_labor_endowment(par), 0.0)
+
+    # Cumulative gross returns since the initial age
+    D = np.cumprod(R, axis=1)
+
+    # Consumption growth from the Euler equations
+    growth = np.cumprod(
+        np.where(j > age_init, (par.beta * R)**(1/par.gamma), 1.0), axis=1
+    )
+
+    # Initial consumption from lifetime budget constraint
+    wealth = a_init + np.sum(y / D, axis=1, keepdims=True)
+    c0 = wealth / np.sum(np.where(alive, growth / D, 0.0), axis=1, keepdims=True)
+    c = np.where(alive, c0 * growth, 0.0)
+
+    # Assets from the budget constraint a_{j+1} = R_j a_j + y_j - c_j
+    a = np.zeros((len(a_init), par.J + 1))
+    a[:, 1:] = np.where(alive, D * (a_init + np.cumsum((y - c) / D, axis=1)), 0.0)
+    a[:, :-1] = np.where(j == age_init, a_init, a[:, :-1])
+
+    return c, a
+
+
+def simulate_olg(z_new, eq: SteadyState, T=200, tol=1.0e-8, maxiter=500,
+                 damping=0.5):
+    """
+    Compute the perfect-foresight transition path of the OLG model with
+    J cohorts after an unexpected change in TFP in period 1.
+
+    The path of capital is updated with a damped fixed-point iteration until
+    the capital stock implied by household savings equals the guess.
+    Prices are assumed to remain at their period-T values after period T.
+
+    Parameters
+    ----------
+    z_new : float or array
+        New level of TFP after the shock, or path of TFP for periods 1,...,T.
+    eq : SteadyState
+        Initial steady-state equilibrium before the shock.
+    T : int
+        Number of periods to simulate.
+    tol : float
+        Tolerance for the maximum absolute change in capital.
+    maxiter : int
+        Maximum number of iterations.
+    damping : float
+        Weight on the updated capital path in each iteration.
+
+    Returns
+    -------
+    sim : Simulation
+    """
+
+    par = eq.par
+    J = par.J
+
+    # Time series of TFP, extended to cover the remaining life of all cohorts
+    z = np.empty(T + J + 1)
+    z[0] = par.z
+    z[1:T+1] = z_new
+    z[T+1:] = z[T]
+    par_ = copy.copy(par)
+    par_.z = z
+
+    # Households alive in period 1 keep their steady-state assets and
+    # re-optimize, cohorts born in periods 1,...,T start with zero assets
+    age_init = np.concatenate((np.arange(J), np.zeros(T-1, dtype=int)))
+    t_init = np.concatenate((np.ones(J, dtype=int), np.arange(2, T+1)))
+    a_init = np.concatenate((eq.a[:J], np.zeros(T-1)))
+
+    # Period in which each household has age j, and assets held in that
+    # period (assets at the beginning of ages j0,...,J-1)
+    ages = np.arange(J+1)[None, :]
+    t = t_init[:, None] + ages - age_init[:, None]
+    held = (ages >= age_init[:, None]) & (ages < J)
+
+    # Initial guess: capital remains at initial steady state
+    K = np.full(T + J + 1, eq.K)
+
+    for it in range(maxiter):
+        # Prices implied by capital path
+        r, w = compute_prices(K / eq.L, par_)
+
+        # Solve household problems given prices
+        c, a = solve_hh_path(r, w, a_init, age_init, t_init, par)
+
+        # Aggregate capital: assets held at the beginning of period t
+        K_new = np.full(T + J + 1, eq.K)
+        K_new[1:] = 0.0
+        np.add.at(K_new, t[held], par.N * a[held])
+        # Capital after period T is held constant
+        K_new[T+1:] = K_new[T]
+
+        diff = np.max(np.abs(K_new - K))
+        if diff < tol:
+            break
+
+        K = (1 - damping) * K + damping * K_new
+    else:
+        print('Transition path solver did not terminate successfully')
+
+    # Store time series for periods t = 0,...,T
+    sim = Simulation()
+    sim.K = K[:T+1]
+    sim.r, sim.w = r[:T+1], w[:T+1]
+    sim.z = z[:T+1]
+    sim.Y = sim.z * sim.K**par.alpha * eq.L**(1-par.alpha)
+
+    # Consumption and assets by period and age
+    sim.c = np.zeros((T+1, J))
+    sim.a = np.zeros((T+1, J))
+    sim.c[0] = eq.c
+    sim.a[0] = eq.a[:J]
+    ages = np.broadcast_to(np.arange(J)[None, :], c.shape)
+    alive = held[:, :J] & (t[:, :J] <= T)
+    sim.c[t[:, :J][alive], ages[alive]] = c[alive]
+    sim.a[t[:, :J][alive], ages[alive]] = a[:, :J][alive]
+
+    return sim
+
+
+if __name__ == '__main__':
+
+    import time
+
+    # Create parameter instance
+    par = Parameters()
+
+    # Solve for the steady state
+    t0 = time.perf_counter()
+    eq = compute_steady_state(par)
+    t1 = time.perf_counter()
+
+    print(f'Steady-state equilibrium (J = {par.J}, {1000*(t1-t0):.1f} msec):')
+    print(f'  K = {eq.K:.5f}')
+    print(f'  Y = {eq.Y:.5f}')
+    print(f'  r = {eq.r:.5f}')
+    print(f'  w = {eq.w:.5f}')
+
+    # Transition after a permanent 10% drop in TFP
+    t0 = time.perf_counter()
+    sim = simulate_olg(0.9 * par.z, eq, T=200)
+    t1 = time.perf_counter()
+
+    eq_new = compute_steady_state(Parameters(z=0.9 * par.z))
+    print(f'Transition path ({t1-t0:.3f} sec.):')
+    print(f'  K_T = {sim.K[-1]:.5f}, new steady state K = {eq_new.K:.5f}')
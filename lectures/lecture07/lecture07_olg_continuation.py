@@ -0,0 +1,315 @@
+"""
+Lecture 7: Continuation methods for comparative statics in the OLG model
+
+This module traces the steady state of the OLG model along a 1-D or 2-D grid
+of parameter values. Each steady state is solved with a safeguarded Newton
+method starting from a prediction based on the previously computed
+steady state and its derivative with respect to the parameter
+(predictor-corrector), which typically requires only 2-3 evaluations of
+the excess demand function per grid point.
+"""
+
+import copy
+import numpy as np
+
+from lecture07_olg import (
+    Parameters, compute_capital_ex_demand, compute_capital_ex_demand_deriv
+)
+from lecture07_olg_batch import (
+    stack_parameters, compute_steady_state_from_capital
+)
+from lecture07_olg_calibration import PARAMETERS, compute_capital_param_deriv
+
+
+# Max. step in log k while no bracket is available
+MAX_WIDTH = 1.0
+
+
+def solve_from_guess(par: Parameters, k_guess, width=1.0e-2, rtol=1.0e-12,
+                     maxiter=100):
+    """
+    Find the root of the excess demand for capital starting from a guess.
+
+    Newton steps are taken as long as they remain inside the bracket of
+    points with opposite signs of excess demand found so far. While no such
+    bracket is available, steps are limited to `width` in terms of log k,
+    and `width` is doubled (up to MAX_WIDTH) whenever this limit is hit.
+    All iterates therefore remain positive, and since convergence is tested
+    with a relative tolerance, the trivial root at k = 0 is never returned.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem
+    k_guess : float
+        Initial guess for the capital-labor ratio (positive)
+    width : float
+        Initial maximum step size in log k
+    rtol : float
+        Relative tolerance on the root
+    maxiter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    k : float
+        Capital-labor ratio which sets excess demand to zero
+    n_evals : int
+        Number of evaluations of the excess demand function
+    converged : bool
+        True if the root-finder converged
+    """
+
+    # Points with negative and positive excess demand
+    k_neg, k_pos = None, None
+
+    k = float(k_guess)
+    if not (np.isfinite(k) and k > 0):
+        return k, 0, False
+
+    for n_evals in range(1, maxiter+1):
+        f = compute_capital_ex_demand(k, par)
+        df = compute_capital_ex_demand_deriv(k, par)
+
+        if f == 0:
+            return k, n_evals, True
+
+        if f < 0:
+            k_neg = k
+        else:
+            k_pos = k
+
+        # Newton step
+        k_new = k - f / df
+
+        if k_neg is not None and k_pos is not None:
+            # Bisect if Newton step leaves the bracket
+            lo, hi = min(k_neg, k_pos), max(k_neg, k_pos)
+            if not lo < k_new < hi:
+                k_new = (lo + hi) / 2
+        elif not (np.isfinite(k_new) and k_new > 0) or abs(np.log(k_new / k)) > width:
+            # Limit step size in log k and expand the search width. Excess
+            # demand is increasing in k around a stable steady state.
+            k_new = k * np.exp(-width if f > 0 else width)
+            width = min(2 * width, MAX_WIDTH)
+
+        if abs(k_new - k) <= rtol * k:
+            return k_new, n_evals, True
+
+        k = k_new
+
+    return k, maxiter, False
+
+
+def _initial_guess(par: Parameters):
+    """
+    Initial guess for the capital-labor ratio implied by log utility.
+    """
+
+    s = par.beta / (1 + par.beta)
+
+    return (s * (1 - par.alpha) * par.z)**(1 / (1 - par.alpha))
+
+
+def _is_valid(k):
+    return np.all(np.isfinite(k)) and np.all(np.asarray(k) > 0)
+
+
+def _predict(par: Parameters, name, k, theta, i):
+    """
+    Predict the solution at point i from the solution at point i-1.
+
+    The predictor is linear in log k. For parameters in PARAMETERS, the
+    slope dk/dtheta is computed with the implicit function theorem;
+    otherwise it is the secant through points i-2 and i-1. Returns None if
+    there is no valid previous solution or the predicted change is large.
+    """
+
+    if i == 0 or not _is_valid(k[i-1]):
+        return None
+
+    if name in PARAMETERS:
+        par_prev = copy.copy(par)
+        setattr(par_prev, name, theta[i-1])
+        slope = compute_capital_param_deriv(k[i-1], par_prev, [name])[name] / k[i-1]
+    elif i >= 2 and _is_valid(k[i-2]):
+        slope = np.log(k[i-1] / k[i-2]) / (theta[i-1] - theta[i-2])
+    else:
+        slope = 0.0
+
+    # Predicted change in log k. A linear prediction is not reliable for
+    # large changes, in which case None is returned as well.
+    dlog_k = slope * (theta[i] - theta[i-1])
+    if not abs(dlog_k) <= MAX_WIDTH:
+        return None
+
+    return k[i-1] * np.exp(dlog_k)
+
+
+def _width(k_pred, k_prev):
+    """
+    Initial search width in log k given the size of the predicted change.
+    """
+
+    return min(max(4 * abs(np.log(k_pred / k_prev)), 1.0e-4), MAX_WIDTH)
+
+
+def trace_steady_states(par: Parameters, name, values):
+    """
+    Compute steady states along a path of values for one parameter.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem (other than the varied one)
+    name : str
+        Name of the parameter to vary, e.g. 'beta'
+    values : array
+        Values of the varied parameter
+
+    Returns
+    -------
+    eq : SteadyStateBatch
+        Steady states for each parameter value
+    n_evals : numpy.ndarray
+        Number of excess-demand evaluations for each parameter value
+    """
+
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+
+    k = np.empty(n)
+    n_evals = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    pars = []
+
+    for i in range(n):
+        par_i = copy.copy(par)
+        setattr(par_i, name, values[i])
+        pars.append(par_i)
+
+        # Predictor step
+        k_pred = _predict(par, name, k, values, i)
+        if k_pred is None:
+            k_pred = _initial_guess(par_i)
+            width = 1.0e-1
+        else:
+            width = _width(k_pred, k[i-1])
+
+        # Corrector step
+        k[i], n_evals[i], converged[i] = solve_from_guess(par_i, k_pred, width)
+
+        if not converged[i]:
+            print(f'Equilibrium root-finder did not terminate successfully for {name}={values[i]}')
+
+    eq = compute_steady_state_from_capital(k, stack_parameters(pars), converged)
+
+    return eq, n_evals
+
+
+def trace_steady_states_2d(par: Parameters, names, values1, values2):
+    """
+    Compute steady states on a 2-D grid of values for two parameters.
+
+    The grid is traversed row by row. The prediction for each point uses
+    the solutions at the neighboring points in the same row and column.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem (other than the varied ones)
+    names : tuple of str
+        Names of the two parameters to vary
+    values1 : array
+        Values of the first parameter (rows)
+    values2 : array
+        Values of the second parameter (columns)
+
+    Returns
+    -------
+    eq : SteadyStateBatch
+        Steady states on the grid, with attributes of shape (n1, n2)
+    n_evals : numpy.ndarray
+        Number of excess-demand evaluations for each grid point
+    """
+
+    values1 = np.asarray(values1, dtype=float)
+    values2 = np.asarray(values2, dtype=float)
+    n1, n2 = len(values1), len(values2)
+
+    # Trace first column as 1-D path
+    par_ = copy.copy(par)
+    setattr(par_, names[1], values2[0])
+    eq0, n_evals0 = trace_steady_states(par_, names[0], values1)
+
+    k = np.empty((n1, n2))
+    n_evals = np.zeros((n1, n2), dtype=int)
+    converged = np.zeros((n1, n2), dtype=bool)
+    k[:, 0] = eq0.K / eq0.L
+    n_evals[:, 0] = n_evals0
+    converged[:, 0] = eq0.converged
+    pars = [[None] * n2 for i in range(n1)]
+
+    for i in range(n1):
+        for j in range(n2):
+            par_ij = copy.copy(par)
+            setattr(par_ij, names[0], values1[i])
+            setattr(par_ij, names[1], values2[j])
+            pars[i][j] = par_ij
+
+            if j == 0:
+                continue
+
+            if i > 0 and _is_valid([k[i, j-1], k[i-1, j], k[i-1, j-1]]):
+                # Change (in logs) along row from previous row
+                k_pred = k[i, j-1] * k[i-1, j] / k[i-1, j-1]
+            else:
+                par_i = copy.copy(par)
+                setattr(par_i, names[0], values1[i])
+                k_pred = _predict(par_i, names[1], k[i], values2, j)
+
+            if k_pred is None:
+                k_pred = _initial_guess(par_ij)
+                width = 1.0e-1
+            else:
+                width = _width(k_pred, k[i, j-1])
+            k[i, j], n_evals[i, j], converged[i, j] = \
+                solve_from_guess(par_ij, k_pred, width)
+
+            if not converged[i, j]:
+                print(f'Equilibrium root-finder did not terminate successfully for '
+                      f'{names[0]}={values1[i]}, {names[1]}={values2[j]}')
+
+    par_batch = stack_parameters([p for row in pars for p in row])
+    for name in vars(par_batch):
+        setattr(par_batch, name, getattr(par_batch, name).reshape((n1, n2)))
+
+    eq = compute_steady_state_from_capital(k, par_batch, converged)
+
+    return eq, n_evals
+
+
+if __name__ == '__main__':
+
+    from lecture07_olg import compute_steady_state
+
+    par = Parameters()
+
+    # Trace steady state along a fine grid of discount factors
+    beta = np.linspace(0.90, 0.99, 1000)**30
+    eq, n_evals = trace_steady_states(par, 'beta', beta)
+
+    print(f'1-D path: {len(beta)} points, '
+          f'avg. evaluations per point: {np.mean(n_evals):.2f}')
+
+    # Compare to the bracketing root-finder for one point
+    par_i = Parameters(beta=beta[500])
+    eq_i = compute_steady_state(par_i)
+    print(f'Difference in K vs. compute_steady_state(): {eq.K[500] - eq_i.K:.3e}')
+
+    # Trace steady state on a 2-D grid of alpha and beta
+    alpha = np.linspace(0.25, 0.45, 50)
+    eq, n_evals = trace_steady_states_2d(par, ('alpha', 'beta'), alpha, beta[::10])
+
+    print(f'2-D grid: {n_evals.size} points, '
+          f'avg. evaluations per point: {np.mean(n_evals):.2f}')
@@ -0,0 +1,197 @@
+"""
+Lecture 7: OLG model with heterogeneous households
+
+This module extends the two-period OLG model to many household types which
+differ in their patience (beta), risk aversion (gamma) and labor
+productivity. Each type has a population weight. Savings of all types are
+computed as one vectorized expression for given prices, and aggregate
+capital supply is a weighted sum over types.
+"""
+
+import numpy as np
+from dataclasses import dataclass, fields
+from scipy.optimize import root_scalar
+
+from lecture07_olg import Parameters, compute_prices, compute_savings_rate
+
+
+@dataclass
+class HouseholdTypes:
+    """
+    Preferences, productivity and population weights of household types.
+
+    All attributes are broadcast to a common 1-D shape on creation and
+    weights are normalized to sum to one.
+    """
+    beta: np.ndarray = Parameters.beta      # Discount factor
+    gamma: np.ndarray = Parameters.gamma    # RRA in utility
+    e: np.ndarray = 1.0                     # Labor productivity
+    weight: np.ndarray = None               # Population weight
+
+    def __post_init__(self):
+        if self.weight is None:
+            self.weight = 1.0
+        names = [f.name for f in fields(self)]
+        values = np.broadcast_arrays(
+            *[np.atleast_1d(np.asarray(getattr(self, name), dtype=float)) for name in names]
+        )
+        for name, value in zip(names, values):
+            setattr(self, name, np.array(value))
+        self.weight /= np.sum(self.weight)
+
+
+@dataclass
+class SteadyState:
+    """
+    Steady-state equilibrium of the OLG model with heterogeneous households.
+    """
+    par: Parameters = None          # Parameters used to compute equilibrium
+    types: HouseholdTypes = None    # Household types
+    c_y: np.ndarray = None          # Consumption when young, by type
+    c_o: np.ndarray = None          # Consumption when old, by type
+    a: np.ndarray = None            # Savings when young, by type
+    s: np.ndarray = None            # Savings rate when young, by type
+    r: float = None                 # Interest rate (return on capital)
+    w: float = None                 # Wage rate (per efficiency unit)
+    K: float = None                 # Aggregate capital stock
+    L: float = None                 # Aggregate labor supply (efficiency units)
+    I: float = None                 # Aggregate investment
+    Y: float = None                 # Aggregate output
+
+
+def compute_labor_supply(par: Parameters, types: HouseholdTypes):
+    """
+    Compute aggregate labor supply in efficiency units.
+
+    Parameters
+    ----------
+    par : Parameters
+    types : HouseholdTypes
+
+    Returns
+    -------
+    L : float
+    """
+
+    L = par.N * np.dot(types.weight, types.e)
+
+    return L
+
+
+def compute_capital_ex_demand(k, par: Parameters, types: HouseholdTypes):
+    """
+    Compute the excess demand for capital.
+
+    Parameters
+    ----------
+    k : float
+        Capital-labor ratio
+    par : Parameters
+        Parameters for the given problem (technology and population)
+    types : HouseholdTypes
+        Household types
+
+    Returns
+    -------
+    ex_demand : float
+        Excess demand for capital
+    """
+
+    # Compute prices from firm's FOCs
+    r, w = compute_prices(k, par)
+
+    # Savings rates of all types
+    srate = compute_savings_rate(r, types)
+
+    # Aggregate supply of capital: population-weighted savings
+    A = par.N * np.dot(types.weight, srate * w * types.e)
+
+    # Aggregate capital demand
+    K = k * compute_labor_supply(par, types)
+
+    # Excess demand for capital
+    ex_demand = K - A
+
+    return ex_demand
+
+
+def compute_steady_state(par: Parameters, types: HouseholdTypes):
+    """
+    Compute the steady-state equilibrium for the OLG model with
+    heterogeneous households.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem (technology and population)
+    types : HouseholdTypes
+        Household types
+
+    Returns
+    -------
+    eq : SteadyState
+        Steady state equilibrium of the OLG model
+    """
+
+    # Find the equilibrium k=K/L with a root-finder. Excess demand for capital
+    # has to be zero in equilibrium.
+    res = root_scalar(
+        compute_capital_ex_demand, bracket=(1.0e-3, 10), args=(par, types)
+    )
+
+    if not res.converged:
+        print('Equilibrium root-finder did not terminate successfully')
+
+    # Aggregate labor supply
+    L = compute_labor_supply(par, types)
+
+    # Create instance of equilibrium class
+    eq = SteadyState(par=par, types=types, K=res.root * L, L=L)
+
+    # Equilibrium prices
+    eq.r, eq.w = compute_prices(res.root, par)
+
+    # Investment in steady state
+    eq.I = eq.K * par.delta
+
+    # Equilibrium household choices by type
+    eq.s = compute_savings_rate(eq.r, types)
+    eq.a = eq.s * eq.w * types.e
+    eq.c_y = eq.w * types.e - eq.a
+    eq.c_o = (1 + eq.r) * eq.a
+
+    # Equilibrium output
+    eq.Y = par.z * eq.K**par.alpha * eq.L**(1-par.alpha)
+
+    # Aggregate consumption
+    C = par.N * np.dot(types.weight, eq.c_y + eq.c_o)
+    # Check that goods market clearing holds using Y = C + I
+    assert abs(eq.Y - C - eq.I) < 1.0e-8
+
+    return eq
+
+
+if __name__ == '__main__':
+
+    import time
+    from lecture07_olg import compute_steady_state as compute_steady_state_ra
+
+    par = Parameters()
+
+    # Representative agent as special case with a single type
+    eq = compute_steady_state(par, HouseholdTypes(beta=par.beta, gamma=par.gamma))
+    eq_ra = compute_steady_state_ra(par)
+    print(f'Single type: K = {eq.K:.5f} (representative agent: {eq_ra.K:.5f})')
+
+    # 10,000 types with heterogeneous patience and productivity
+    rng = np.random.default_rng(seed=1234)
+    n = 10_000
+    types = HouseholdTypes(
+        beta=rng.uniform(0.94, 0.98, size=n)**30,
+        e=np.exp(rng.normal(-0.5*0.5**2, 0.5, size=n)),
+    )
+
+    t0 = time.perf_counter()
+    eq = compute_steady_state(par, types)
+    t1 = time.perf_counter()
+    print(f'{n} types: K = {eq.K:.5f}, r = {eq.r:.5f} ({1000*(t1-t0):.1f} msec)')
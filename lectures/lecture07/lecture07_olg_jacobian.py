@@ -0,0 +1,256 @@
+"""
+Lecture 7: Sequence-space Jacobians of the OLG model
+
+This module linearizes the transition dynamics of the OLG model around a
+steady state and computes the sequence-space Jacobians of the main aggregates
+with respect to the path of TFP. Once computed, the (first-order) impulse
+response to any TFP path is a matrix-vector product.
+
+Time is indexed as in simulate_olg(): period 0 is the initial steady state,
+and the TFP path z_1,...,z_T is revealed at the beginning of period 1.
+"""
+
+import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, astuple
+
+from lecture07_olg import (
+    SteadyState, Simulation, compute_prices_deriv, compute_savings_rate_deriv,
+    simulate_olg
+)
+
+
+# Variables for which Jacobians are computed
+JACOBIAN_VARIABLES = ('K', 'r', 'w', 'Y', 'a', 's', 'c_y', 'c_o')
+
+# Max. number of Jacobians kept in the cache (each entry holds
+# len(JACOBIAN_VARIABLES) arrays of shape (T+1, T+1))
+MAX_CACHE_SIZE = 16
+
+# Cache of previously computed Jacobians, least recently used first
+_cache = OrderedDict()
+
+
+@dataclass
+class Jacobians:
+    """
+    Sequence-space Jacobians with respect to the TFP path.
+
+    Each attribute is a (T+1, T+1) array with element [t, j] containing the
+    response of the variable in period t to a unit change in z_j. Column 0
+    is zero since TFP in period 0 is fixed at its steady-state value.
+    """
+    eq: SteadyState = None      # Steady state used for linearization
+    T: int = None               # Number of periods
+    K: np.ndarray = None        # Aggregate capital stock
+    r: np.ndarray = None        # Interest rate
+    w: np.ndarray = None        # Wage rate
+    Y: np.ndarray = None        # Aggregate output
+    a: np.ndarray = None        # Savings when young
+    s: np.ndarray = None        # Savings rate when young
+    c_y: np.ndarray = None      # Consumption when young
+    c_o: np.ndarray = None      # Consumption when old
+
+
+def compute_jacobians(eq: SteadyState, T):
+    """
+    Compute the sequence-space Jacobians around a steady state.
+
+    Parameters
+    ----------
+    eq : SteadyState
+        Steady-state equilibrium around which to linearize.
+    T : int
+        Number of periods.
+
+    Returns
+    -------
+    jac : Jacobians
+    """
+
+    par = eq.par
+    N = par.N
+    k = eq.K / eq.L
+
+    # Partial derivatives of prices w.r.t. K and z
+    r_k, w_k = compute_prices_deriv(k, par)
+    r_K, w_K = r_k / N, w_k / N
+    r_z = par.alpha * k**(par.alpha - 1)
+    w_z = (1 - par.alpha) * k**par.alpha
+    # Partial derivatives of output
+    Y_K = par.alpha * eq.Y / eq.K
+    Y_z = eq.Y / par.z
+    # Derivative of savings rate w.r.t. r
+    ds = compute_savings_rate_deriv(eq.r, par)
+
+    # Linearized law of motion for capital, t = 1,...,T:
+    #   dK_{t+1} = rho * dK_t + b0 * dz_t + b1 * dz_{t+1}
+    # where dK_1 = 0 and dz_{T+1} = dz_T.
+    D = 1 - N * ds * r_K * eq.w
+    rho = N * eq.s * w_K / D
+    b0 = N * eq.s * w_z / D
+    b1 = N * ds * eq.w * r_z / D
+
+    # Response of K_m (m = 0,...,T+1) to z_j (j = 0,...,T)
+    m = np.arange(T+2)[:, None]
+    j = np.arange(T+1)[None, :]
+    lag = m - j
+    with np.errstate(over='ignore'):
+        decay = float(rho)**np.maximum(lag, 0)
+        decay_1 = float(rho)**np.maximum(lag - 1, 0)
+    # dz_j enters the equation for K_{j+1} with coefficient b0
+    G_K = np.where(lag >= 1, b0 * decay_1, 0.0)
+    # dz_j enters the equation for K_j with coefficient b1 (for j >= 2)
+    G_K += np.where((lag >= 0) & (j >= 2), b1 * decay, 0.0)
+    # TFP in period 0 is fixed
+    G_K[:, 0] = 0.0
+    # dz_T also enters the last equation as dz_{T+1}
+    G_K[T+1, T] += b1
+
+    # Direct effect of TFP (zero in period 0)
+    E = np.eye(T+1)
+    E[0, 0] = 0.0
+
+    jac = Jacobians(eq=eq, T=T)
+    jac.K = G_K[:T+1]
+    jac.r = r_K * jac.K + r_z * E
+    jac.w = w_K * jac.K + w_z * E
+    jac.Y = Y_K * jac.K + Y_z * E
+    jac.a = G_K[1:] / N
+    jac.s = (jac.a - eq.s * jac.w) / eq.w
+    jac.c_y = jac.w - jac.a
+    jac.c_o = eq.a * jac.r + (1 + eq.r) / N * jac.K
+
+    return jac
+
+
+def get_jacobians(eq: SteadyState, T):
+    """
+    Return the sequence-space Jacobians, reusing previously computed
+    Jacobians for the same steady state and number of periods.
+
+    At most MAX_CACHE_SIZE Jacobians are kept, and the least recently used
+    ones are removed first.
+
+    Parameters
+    ----------
+    eq : SteadyState
+        Steady-state equilibrium around which to linearize.
+    T : int
+        Number of periods.
+
+    Returns
+    -------
+    jac : Jacobians
+    """
+
+    key = (astuple(eq.par), eq.K, T)
+
+    if key in _cache:
+        _cache.move_to_end(key)
+    else:
+        _cache[key] = compute_jacobians(eq, T)
+        while len(_cache) > MAX_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return _cache[key]
+
+
+def clear_cache():
+    """
+    Remove all previously computed Jacobians from the cache.
+    """
+
+    _cache.clear()
+
+
+def impulse_response(jac: Jacobians, dz):
+    """
+    Compute the linearized response to a TFP path.
+
+    Parameters
+    ----------
+    jac : Jacobians
+    dz : numpy.ndarray
+        Deviations of TFP from its steady-state value for periods 0,...,T.
+        Can be a (T+1, n) array to compute the responses to n TFP paths
+        at once. The period-0 deviation is ignored.
+
+    Returns
+    -------
+    sim : Simulation
+        Time series implied by the linearized model (in levels). Each
+        time series has the same shape as dz.
+    """
+
+    eq = jac.eq
+    dz = np.asarray(dz, dtype=float)
+
+    sim = Simulation()
+    for name in JACOBIAN_VARIABLES:
+        setattr(sim, name, getattr(eq, name) + getattr(jac, name) @ dz)
+
+    sim.z = eq.par.z + dz
+    sim.z[0] = eq.par.z
+
+    return sim
+
+
+def check_nonlinear(jac: Jacobians, dz):
+    """
+    Compare the linearized response to the exact nonlinear transition path.
+
+    Parameters
+    ----------
+    jac : Jacobians
+    dz : numpy.ndarray
+        Deviations of TFP from its steady-state value for periods 0,...,T.
+
+    Returns
+    -------
+    errors : dict
+        Maximum absolute difference between the linearized and the
+        simulated time series for each variable.
+    """
+
+    sim_lin = impulse_response(jac, dz)
+    sim = simulate_olg(sim_lin.z[1:], jac.eq, jac.T)
+
+    errors = {
+        name: np.max(np.abs(getattr(sim, name) - getattr(sim_lin, name)))
+        for name in JACOBIAN_VARIABLES
+    }
+
+    return errors
+
+
+if __name__ == '__main__':
+
+    import time
+    from lecture07_olg import Parameters, compute_steady_state
+
+    # Initial steady state
+    eq = compute_steady_state(Parameters())
+
+    # Number of periods
+    T = 100
+
+    t0 = time.perf_counter()
+    jac = get_jacobians(eq, T)
+    t1 = time.perf_counter()
+    print(f'Computed Jacobians in {t1 - t0:.3f} sec.')
+
+    # Battery of 5,000 AR(1) TFP shocks with different persistence
+    rho = np.linspace(0.0, 0.95, 5000)
+    dz = np.zeros((T+1, len(rho)))
+    dz[1:] = -0.01 * rho[None, :]**np.arange(T)[:, None]
+
+    t0 = time.perf_counter()
+    sim = impulse_response(jac, dz)
+    t1 = time.perf_counter()
+    print(f'Computed {dz.shape[1]} impulse responses in {t1 - t0:.3f} sec.')
+
+    # Compare a single impulse response to the nonlinear transition path
+    errors = check_nonlinear(jac, dz[:, -1])
+    for name, err in errors.items():
+        print(f'  Max. abs. error in {name}: {err:.3e}')
@@ -0,0 +1,148 @@
+"""
+Lecture 7: Batch rendering of OLG simulation figures
+
+This module saves figures of many simulated transitions to files. Instead of
+creating a new figure for each simulation as in plot_simulation(), each
+worker process creates one figure per layout (with or without new steady
+state, markers, deviations) and only updates the data of its lines for each
+simulation. Figures are rendered with the non-interactive Agg backend and
+closed once all simulations assigned to a worker have been saved.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+
+def _init_worker():
+    # Use non-interactive backend in worker processes
+    matplotlib.use('Agg')
+
+
+def _render_chunk(scenarios, filenames, formats, deviations):
+    """
+    Render a sequence of simulations, reusing one figure per layout.
+    """
+
+    import matplotlib.pyplot as plt
+    from lecture07_olg import create_simulation_figure, update_simulation_figure
+
+    # Figure and artists for each layout
+    figures = {}
+
+    try:
+        for (eq, sim, eq_new), filename in zip(scenarios, filenames):
+            layout = (eq_new is not None, deviations, 'o' if len(sim.K) < 30 else None)
+
+            if layout not in figures:
+                figures[layout] = create_simulation_figure(*layout)
+
+            fig, artists = figures[layout]
+            update_simulation_figure(artists, eq, sim, eq_new, deviations)
+
+            # Axis limits and tick labels depend on the data, so the layout
+            # is recomputed for each simulation. tight_layout() starts from
+            # the current subplot parameters, which are reset to those of a
+            # new figure to obtain the same layout as plot_simulation().
+            fig.subplots_adjust(**{
+                name: matplotlib.rcParams[f'figure.subplot.{name}']
+                for name in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+            })
+            fig.tight_layout()
+
+            for fmt in formats:
+                fig.savefig(f'{filename}.{fmt}')
+    finally:
+        for fig, _ in figures.values():
+            plt.close(fig)
+
+    return len(filenames)
+
+
+def render_simulations(scenarios, filenames, formats=('png', ), deviations=True,
+                       workers=None, chunksize=25):
+    """
+    Save figures of simulated time series for many scenarios.
+
+    Parameters
+    ----------
+    scenarios : sequence of tuple
+        Tuples (eq, sim, eq_new) with the arguments passed to
+        plot_simulation(). eq_new may be None.
+    filenames : sequence of str
+        File name for each scenario, without extension.
+    formats : sequence of str
+        File formats (extensions) in which each figure is saved,
+        e.g. ('png', 'pdf').
+    deviations : bool
+        If True, plot deviations from the initial steady state instead
+        of absolute values.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    chunksize : int
+        Number of scenarios rendered by a worker with the same figures
+        before they are closed. This limits the number of open figures.
+
+    Returns
+    -------
+    n : int
+        Number of rendered scenarios
+    """
+
+    if len(scenarios) != len(filenames):
+        raise ValueError('Number of scenarios and file names must be equal')
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    # Split scenarios into chunks of consecutive scenarios
+    chunks = [
+        (scenarios[i:i+chunksize], filenames[i:i+chunksize])
+        for i in range(0, len(scenarios), chunksize)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(_render_chunk, s, f, formats, deviations) for s, f in chunks
+        ]
+        n = sum(future.result() for future in futures)
+
+    return n
+
+
+if __name__ == '__main__':
+
+    import time
+    import tempfile
+    import numpy as np
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from lecture07_olg import (
+        Parameters, compute_steady_state, simulate_olg, plot_simulation
+    )
+
+    par = Parameters(gamma=1)
+    eq = compute_steady_state(par)
+
+    # Scenarios with TFP drops of different size
+    scenarios = []
+    for z_new in np.linspace(0.8, 0.99, 40) * par.z:
+        sim = simulate_olg(z_new, eq, T=20)
+        eq_new = compute_steady_state(Parameters(gamma=par.gamma, z=z_new))
+        scenarios.append((eq, sim, eq_new))
+
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = [os.path.join(directory, f'scenario{i:03d}') for i in range(len(scenarios))]
+
+        t0 = time.perf_counter()
+        for (eq, sim, eq_new), filename in zip(scenarios, filenames):
+            plot_simulation(eq, sim, eq_new, filename=f'{filename}.png')
+            plt.close()
+        t1 = time.perf_counter()
+        print(f'plot_simulation(): {t1 - t0:.2f} sec. for {len(scenarios)} figures')
+
+        t0 = time.perf_counter()
+        render_simulations(scenarios, filenames)
+        t1 = time.perf_counter()
+        print(f'render_simulations(): {t1 - t0:.2f} sec. for {len(scenarios)} figures')
@@ -0,0 +1,150 @@
+"""
+Lecture 7: Finding all steady states of the OLG model
+
+compute_steady_state() assumes that the excess demand for capital has
+exactly one root inside a fixed bracket. This module instead evaluates the
+excess demand on a dense grid of capital-labor ratios, locates all sign
+changes and polishes all roots at once. Each steady state is classified
+as stable or unstable based on the slope of the law of motion for capital.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+
+from lecture07_olg import (
+    Parameters, compute_prices, compute_prices_deriv, compute_savings_rate,
+    compute_savings_rate_deriv, compute_capital_ex_demand
+)
+from lecture07_olg_batch import (
+    SteadyStateBatch, stack_parameters, solve_capital_ex_demand,
+    compute_steady_state_from_capital
+)
+
+
+@dataclass
+class SteadyStates:
+    """
+    All steady states of an OLG model, sorted by capital-labor ratio.
+    """
+    k: np.ndarray = None                # Capital-labor ratios
+    slope: np.ndarray = None            # Slope of law of motion dk'/dk
+    stable: np.ndarray = None           # True if steady state is stable
+    eq: SteadyStateBatch = None         # Steady-state equilibria
+
+
+def compute_law_of_motion_deriv(k, par: Parameters):
+    """
+    Compute the slope of the law of motion for capital at a steady state.
+
+    The capital-labor ratio evolves according to
+        k_{t+1} = s(r(k_{t+1})) * w(k_t)
+    so that by the implicit function theorem
+        dk_{t+1}/dk_t = s * w'(k) / (1 - s'(r) * r'(k) * w).
+
+    Parameters
+    ----------
+    k : float or array
+        Steady-state capital-labor ratio
+    par : Parameters
+        Parameters for the given problem
+
+    Returns
+    -------
+    slope : float or array
+        Derivative of k_{t+1} w.r.t. k_t
+    """
+
+    r, w = compute_prices(k, par)
+    s = compute_savings_rate(r, par)
+    dr, dw = compute_prices_deriv(k, par)
+    ds = compute_savings_rate_deriv(r, par)
+
+    with np.errstate(divide='ignore'):
+        slope = s * dw / (1 - ds * dr * w)
+
+    return slope
+
+
+def find_steady_states(par: Parameters, k_min=1.0e-6, k_max=1.0e3, n=100_000):
+    """
+    Find all steady states with capital-labor ratios in [k_min, k_max].
+
+    Roots are located as sign changes of the excess demand for capital on a
+    log-spaced grid. Roots at which the excess demand touches zero without
+    changing sign, or pairs of roots closer than the grid spacing, are not
+    detected.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters for the given problem
+    k_min : float
+        Smallest capital-labor ratio on the grid
+    k_max : float
+        Largest capital-labor ratio on the grid
+    n : int
+        Number of grid points
+
+    Returns
+    -------
+    SteadyStates
+        All steady states found, sorted by capital-labor ratio. The arrays
+        are empty if there is no sign change on the grid.
+    """
+
+    k_grid = np.geomspace(k_min, k_max, n)
+
+    # Excess demand on the whole grid in one vectorized call
+    f = compute_capital_ex_demand(k_grid, par)
+    sign = np.sign(f)
+
+    # Grid points which are exact roots
+    exact = np.flatnonzero(sign == 0)
+
+    # Intervals with a sign change between nonzero values
+    i = np.flatnonzero(sign[:-1] * sign[1:] < 0)
+
+    # Polish all roots at once
+    k, converged = solve_capital_ex_demand(par, lo=k_grid[i], hi=k_grid[i+1])
+    k = np.concatenate((k, k_grid[exact]))
+    converged = np.concatenate((converged, np.ones(len(exact), dtype=bool)))
+
+    # Sort roots and convergence flags together
+    order = np.argsort(k)
+    k, converged = k[order], converged[order]
+
+    if len(k) == 0:
+        print(f'No steady state found for k in [{k_min}, {k_max}]')
+    elif not np.all(converged):
+        print('Equilibrium root-finder did not terminate successfully')
+
+    eq = compute_steady_state_from_capital(
+        k, stack_parameters([par] * len(k)), converged
+    )
+
+    slope = compute_law_of_motion_deriv(k, par)
+
+    return SteadyStates(k=k, slope=slope, stable=np.abs(slope) < 1, eq=eq)
+
+
+if __name__ == '__main__':
+
+    import time
+
+    # Default parameters have a unique, stable steady state
+    t0 = time.perf_counter()
+    ss = find_steady_states(Parameters())
+    t1 = time.perf_counter()
+    print(f'Default parameters ({1000*(t1-t0):.1f} msec):')
+    for k, slope, stable in zip(ss.k, ss.slope, ss.stable):
+        print(f'  k = {k:.6f}, slope = {slope:.4f}, {"stable" if stable else "unstable"}')
+
+    # Steady state outside the bracket used by compute_steady_state(),
+    # and parameters without any steady state with positive capital
+    for par in (Parameters(z=200), Parameters(alpha=0.9)):
+        t0 = time.perf_counter()
+        ss = find_steady_states(par)
+        t1 = time.perf_counter()
+        print(f'z={par.z}, alpha={par.alpha} ({1000*(t1-t0):.1f} msec):')
+        for k, slope, stable in zip(ss.k, ss.slope, ss.stable):
+            print(f'  k = {k:.6f}, slope = {slope:.4f}, {"stable" if stable else "unstable"}')
@@ -0,0 +1,178 @@
+"""
+Lecture 7: OLG model with stochastic TFP
+
+This module simulates the OLG model with log utility when log TFP follows
+an AR(1) process
+    log z_{t+1} = (1-rho) log z_bar + rho log z_t + sigma * eps_{t+1}
+for many independent sample paths at once. With log utility, the savings
+rate does not depend on the (uncertain) future interest rate, so households'
+choices are the same as in the deterministic model.
+"""
+
+import copy
+import numpy as np
+from dataclasses import dataclass
+
+from lecture07_olg import (
+    SteadyState, Simulation, SIM_VARIABLES, compute_prices, initialize_sim
+)
+
+
+@dataclass
+class SimulationMoments:
+    """
+    Container to store cross-path moments of simulated time series
+    """
+    q: np.ndarray = None            # Quantile levels
+    mean: Simulation = None         # Mean across paths, each (T+1,)
+    std: Simulation = None          # Standard deviation across paths, each (T+1,)
+    quantiles: Simulation = None    # Quantiles across paths, each (T+1, len(q))
+
+
+def simulate_olg_stochastic(eq: SteadyState, T, n_paths, rho=0.9, sigma=0.02,
+                            rng=None, chunk=10, moments_only=False,
+                            q=(0.05, 0.25, 0.5, 0.75, 0.95), filename=None):
+    """
+    Simulate the OLG model with AR(1) log TFP for many paths at once.
+
+    All paths start in the deterministic steady state in period 0. Shocks
+    are drawn in chunks of `chunk` periods so that memory use for shocks
+    does not grow with T. The results do not depend on the chunk size.
+
+    Parameters
+    ----------
+    eq : SteadyState
+        Steady-state equilibrium (with log utility) used as initial value.
+        Steady-state TFP is the mean of log TFP.
+    T : int
+        Number of periods to simulate.
+    n_paths : int
+        Number of independent sample paths.
+    rho : float
+        Autocorrelation of log TFP.
+    sigma : float
+        Standard deviation of innovations to log TFP.
+    rng : numpy.random.Generator, optional
+        Random number generator to use.
+    chunk : int
+        Number of periods for which shocks are drawn at once.
+    moments_only : bool
+        If True, return only cross-path moments for each period instead of
+        all sample paths, so that memory use is O(n_paths).
+    q : sequence of float
+        Quantile levels to compute if moments_only is True.
+    filename : str, optional
+        If given (and moments_only is False), store the simulated paths in
+        a memory-mapped .npy file at this location.
+
+    Returns
+    -------
+    Simulation or SimulationMoments
+        Simulation with time series of shape (T+1, n_paths), or cross-path
+        moments if moments_only is True.
+    """
+
+    par = eq.par
+
+    # The following code only works for log utility
+    if par.gamma != 1:
+        raise ValueError('Simulation only implemented for log utility')
+
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    q = np.asarray(q)
+
+    # Savings rate is independent of r for gamma = 1 and constant over time
+    s = par.beta / (1 + par.beta)
+
+    # Copy parameters to avoid changing the original instance
+    par_ = copy.copy(par)
+
+    if moments_only:
+        res = SimulationMoments(
+            q=q, mean=Simulation(), std=Simulation(), quantiles=Simulation()
+        )
+        for name in SIM_VARIABLES:
+            setattr(res.mean, name, np.empty(T+1))
+            setattr(res.std, name, np.empty(T+1))
+            setattr(res.quantiles, name, np.empty((T+1, len(q))))
+    else:
+        res = initialize_sim(T, n_paths=n_paths, filename=filename)
+
+    def store(t, values):
+        # Store cross section of period t
+        for name, x in values.items():
+            if moments_only:
+                getattr(res.mean, name)[t] = np.mean(x)
+                getattr(res.std, name)[t] = np.std(x)
+                getattr(res.quantiles, name)[t] = np.quantile(x, q)
+            else:
+                getattr(res, name)[t] = x
+
+    # Initial period: deterministic steady state
+    log_z = np.full(n_paths, np.log(par.z))
+    a = np.full(n_paths, eq.a)
+    store(0, {name: np.full(n_paths, getattr(eq, name))
+              for name in SIM_VARIABLES if name != 'z'} | {'z': np.exp(log_z)})
+
+    for t in range(1, T+1):
+        # Draw shocks for the next chunk of periods
+        if (t - 1) % chunk == 0:
+            eps = rng.standard_normal(size=(min(chunk, T+1-t), n_paths))
+
+        # Update TFP
+        log_z = (1 - rho) * np.log(par.z) + rho * log_z + sigma * eps[(t-1) % chunk]
+        par_.z = np.exp(log_z)
+
+        # Capital stock is predetermined by savings of old in previous period
+        K = a * par.N
+
+        # Prices given predetermined capital stock and current z
+        r, w = compute_prices(K / par.N, par_)
+
+        # Consumption by the old, savings and consumption by the young
+        c_o = (1 + r) * a
+        a = s * w
+        c_y = (1 - s) * w
+
+        # Aggregate output
+        Y = par_.z * K**par.alpha * par.N**(1-par.alpha)
+
+        store(t, {
+            'c_y': c_y, 'c_o': c_o, 'a': a, 's': np.full(n_paths, s),
+            'r': r, 'w': w, 'K': K, 'Y': Y, 'z': par_.z
+        })
+
+    return res
+
+
+if __name__ == '__main__':
+
+    import time
+    import matplotlib.pyplot as plt
+    from lecture07_olg import Parameters, compute_steady_state
+
+    # Steady state with log utility
+    eq = compute_steady_state(Parameters(gamma=1))
+
+    T = 200
+    n_paths = 100_000
+
+    t0 = time.perf_counter()
+    mom = simulate_olg_stochastic(eq, T, n_paths, moments_only=True)
+    t1 = time.perf_counter()
+    print(f'Simulated {n_paths} paths for {T} periods in {t1 - t0:.2f} sec.')
+
+    # Plot cross-path distribution of capital over time
+    fig, ax = plt.subplots(figsize=(6, 3.5))
+    ax.plot(mom.mean.K, color='black', lw=1, label='Mean')
+    ax.fill_between(
+        np.arange(T+1), mom.quantiles.K[:, 0], mom.quantiles.K[:, -1],
+        color='steelblue', alpha=0.3, lw=0, label='5-95% quantiles'
+    )
+    ax.axhline(eq.K, color='black', lw=0.5, ls='--', label='Steady state')
+    ax.set_xlabel('Period')
+    ax.set_title('Capital $K$')
+    ax.legend()
+    plt.show()
@@ -0,0 +1,476 @@
+"""
+Lecture 8: Inequality measures (Gini coefficient and Lorenz curve)
+
+This module computes Gini coefficients and Lorenz curves for many cross
+sections at once (along one axis of a panel), with optional survey weights,
+and approximately for data which are too large to sort using a mergeable
+quantile sketch. Top and bottom shares only require partial sorting
+(selection), which is faster than sorting for large cross sections.
+
+Negative values (e.g. negative net worth) are allowed. Following
+Raffinetti, Siletti and Vernizzi (2015), the Gini coefficient is normalized
+by the sum of absolute values instead of the sum of values, so that it
+remains in [0, 1]. For nonnegative data this is the usual Gini coefficient.
+"""
+
+import numpy as np
+
+# Max. number of passes over the data for which lorenz_shares() uses
+# partial sorting instead of sorting
+MAX_PARTITION_PASSES = 2.0
+
+
+def gini(x, axis=-1, weights=None, assume_sorted=False):
+    """
+    Compute the Gini coefficient along an axis of an array.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        An array of income, wealth, etc.
+    axis : int
+        Axis along which the Gini coefficient is computed, e.g. axis=1 for
+        a (T, N) panel with one cross section per row.
+    weights : numpy.ndarray, optional
+        Nonnegative weights. x and weights are broadcast against each other,
+        e.g. a grid of values with one distribution per row.
+    assume_sorted : bool
+        If True, x (and weights) are already sorted along axis.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The Gini coefficient(s), with axis removed.
+    """
+
+    x = np.asarray(x, dtype=float)
+
+    if weights is None:
+        x = np.moveaxis(x, axis, -1)
+        if not assume_sorted:
+            x = np.sort(x, axis=-1)
+
+        N = x.shape[-1]
+        ii = np.arange(1, N+1)
+
+        # Sum of |x_i - x_j| over all pairs equals 2 * sum (2i - N - 1) x_(i)
+        G = np.sum((2*ii - N - 1) * x, axis=-1) / (N * np.sum(np.abs(x), axis=-1))
+    else:
+        x, w = np.broadcast_arrays(x, np.asarray(weights, dtype=float))
+        x = np.moveaxis(x, axis, -1)
+        w = np.moveaxis(w, axis, -1)
+
+        if not assume_sorted:
+            order = np.argsort(x, axis=-1)
+            x = np.take_along_axis(x, order, axis=-1)
+            w = np.take_along_axis(w, order, axis=-1)
+
+        # Normalized weights and cumulative weights before/including i
+        p = w / np.sum(w, axis=-1, keepdims=True)
+        F = np.cumsum(p, axis=-1)
+        F_prev = F - p
+
+        G = np.sum(p * x * (F_prev + F - 1), axis=-1) / np.sum(p * np.abs(x), axis=-1)
+
+    return G
+
+
+def lorenz(x, axis=-1, weights=None):
+    """
+    Compute the Lorenz curve along an axis of an array.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        An array of income, wealth, etc.
+    axis : int
+        Axis along which the Lorenz curve is computed.
+    weights : numpy.ndarray, optional
+        Nonnegative weights, broadcast against x.
+
+    Returns
+    -------
+    F : numpy.ndarray
+        Cumulative population shares, starting at 0.
+    L : numpy.ndarray
+        Cumulative shares of the total, starting at 0. The Lorenz curve
+        falls below zero if there are negative values.
+    """
+
+    x = np.asarray(x, dtype=float)
+
+    if weights is None:
+        w = np.ones_like(x)
+    else:
+        x, w = np.broadcast_arrays(x, np.asarray(weights, dtype=float))
+
+    x = np.moveaxis(x, axis, -1)
+    w = np.moveaxis(w, axis, -1)
+
+    order = np.argsort(x, axis=-1)
+    x = np.take_along_axis(x, order, axis=-1)
+    w = np.take_along_axis(w, order, axis=-1)
+
+    F = np.cumsum(w, axis=-1)
+    L = np.cumsum(w * x, axis=-1)
+    F /= F[..., -1:]
+    L /= L[..., -1:]
+
+    # Prepend origin
+    zeros = np.zeros(x.shape[:-1] + (1, ))
+    F = np.concatenate((zeros, F), axis=-1)
+    L = np.concatenate((zeros, L), axis=-1)
+
+    return np.moveaxis(F, -1, axis), np.moveaxis(L, -1, axis)
+
+
+def lorenz_shares(x, p, axis=-1, weights=None, assume_sorted=False):
+    """
+    Compute the share of the total held by the bottom fractions p of the
+    distribution, i.e. the Lorenz curve evaluated at p.
+
+    Without weights, only the order statistics at the positions p * N are
+    needed. For a few fractions such as the top 1% and 10% and the bottom
+    50%, these are found with np.partition() in O(N) time instead of
+    sorting. For many fractions, the data are sorted. If p * N is not an
+    integer, the share includes the fraction p * N - floor(p * N) of the
+    next observation. With weights, the data are sorted.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        An array of income, wealth, etc.
+    p : float or array_like
+        Population fractions in [0, 1], e.g. 0.5 for the bottom 50% or
+        np.linspace(0, 1, 101) for a Lorenz curve with 100 bins.
+    axis : int
+        Axis along which shares are computed, e.g. axis=1 for a (T, N) panel
+        with one cross section per row.
+    weights : numpy.ndarray, optional
+        Nonnegative weights, broadcast against x.
+    assume_sorted : bool
+        If True, x (and weights) are already sorted along axis.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Shares of the total with axis removed and one additional last axis
+        for each element of p (if p is not a scalar).
+    """
+
+    p_scalar = np.ndim(p) == 0
+    p = np.atleast_1d(np.asarray(p, dtype=float))
+
+    x = np.asarray(x, dtype=float)
+
+    if weights is None:
+        x = np.moveaxis(x, axis, -1)
+        N = x.shape[-1]
+
+        # Number of observations fully included and fraction of the next one
+        pos = p * N
+        k = np.minimum(np.floor(pos).astype(int), N - 1)
+        frac = pos - k
+
+        # Partition at increasing positions, each time only the part after
+        # the previous position (so that the values at previous positions
+        # remain in place). This passes over the data
+        # 1 + sum_j (N - kth[j-1] - 1) / N times, which is cheap for a few
+        # shares near the top, but for many positions (e.g. a Lorenz curve
+        # with 100 bins) sorting is faster.
+        kth = np.unique(k)
+        if assume_sorted:
+            part = x
+        elif 1 + np.sum(N - kth[:-1] - 1) / N > MAX_PARTITION_PASSES:
+            part = np.sort(x, axis=-1)
+        else:
+            part = np.array(x)
+            k_prev = -1
+            for k_next in kth:
+                part[..., k_prev+1:].partition(k_next - k_prev - 1, axis=-1)
+                k_prev = k_next
+
+        # part[..., k] is the (k+1)-th smallest value, and the k values
+        # before it are the smallest ones. Sums of blocks between positions
+        # and sums up to each position:
+        kth = np.unique(np.concatenate(([0], kth)))
+        block = np.add.reduceat(part, kth, axis=-1)
+        total = np.sum(block, axis=-1, keepdims=True)
+        cumsum = np.cumsum(block, axis=-1) - block
+        S = cumsum[..., np.searchsorted(kth, k)]
+
+        L = (S + frac * part[..., k]) / total
+    else:
+        x, w = np.broadcast_arrays(x, np.asarray(weights, dtype=float))
+        x = np.moveaxis(x, axis, -1)
+        w = np.moveaxis(w, axis, -1)
+
+        if not assume_sorted:
+            order = np.argsort(x, axis=-1)
+            x = np.take_along_axis(x, order, axis=-1)
+            w = np.take_along_axis(w, order, axis=-1)
+
+        # Lorenz curve including the origin, interpolated at p for each
+        # cross section
+        zeros = np.zeros(x.shape[:-1] + (1, ))
+        F = np.concatenate((zeros, np.cumsum(w, axis=-1)), axis=-1)
+        S = np.concatenate((zeros, np.cumsum(w * x, axis=-1)), axis=-1)
+        F /= F[..., -1:]
+        S /= S[..., -1:]
+
+        F, S = F.reshape((-1, F.shape[-1])), S.reshape((-1, S.shape[-1]))
+        L = np.array([np.interp(p, F[i], S[i]) for i in range(len(F))])
+        L = L.reshape(x.shape[:-1] + (len(p), ))
+
+    if p_scalar:
+        L = L[..., 0]
+
+    return L
+
+
+def top_shares(x, top=(0.01, 0.1), axis=-1, weights=None, assume_sorted=False):
+    """
+    Compute the share of the total held by the top fractions of the
+    distribution.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        An array of income, wealth, etc.
+    top : float or array_like
+        Fractions at the top of the distribution (e.g. 0.01 for the top 1%).
+    axis : int
+        Axis along which shares are computed.
+    weights : numpy.ndarray, optional
+        Nonnegative weights, broadcast against x.
+    assume_sorted : bool
+        If True, x (and weights) are already sorted along axis.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Top shares with axis removed and one additional last axis for each
+        element of top (if top is not a scalar).
+    """
+
+    return 1 - lorenz_shares(x, 1 - np.asarray(top, dtype=float), axis, weights, assume_sorted)
+
+
+class GiniSketch:
+    """
+    Mergeable sketch of a distribution with bounded relative error, similar
+    to DDSketch (Masson, Rim and Lee, 2019).
+
+    Each value x is assigned to a logarithmically spaced bucket such that the
+    bucket's representative value differs from x by at most a relative error
+    alpha. Sketches of different parts of the data can be merged. Since each
+    value is approximated with relative error alpha, the Gini coefficient
+    computed from the sketch differs from the exact one by at most
+    2 * alpha / (1 - alpha).
+    """
+
+    def __init__(self, alpha=1.0e-3):
+        """
+        Parameters
+        ----------
+        alpha : float
+            Relative accuracy of each bucket.
+        """
+
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = np.log(self.gamma)
+
+        # Weights of buckets for positive and negative values, and of zeros
+        self.positive = {}
+        self.negative = {}
+        self.zero = 0.0
+
+    def _add(self, buckets, x, w):
+        # Bucket index i contains values in (gamma^(i-1), gamma^i]
+        index = np.ceil(np.log(x) / self.log_gamma).astype(int)
+        keys, inverse = np.unique(index, return_inverse=True)
+        counts = np.bincount(inverse, weights=w)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            buckets[key] = buckets.get(key, 0.0) + count
+
+    def update(self, x, weights=None):
+        """
+        Add values (with optional weights) to the sketch.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+        weights : numpy.ndarray, optional
+        """
+
+        x = np.ravel(x)
+        w = np.ones(len(x)) if weights is None else np.ravel(np.broadcast_to(weights, np.shape(x)))
+
+        pos, neg = x > 0, x < 0
+        self._add(self.positive, x[pos], w[pos])
+        self._add(self.negative, -x[neg], w[neg])
+        self.zero += np.sum(w[~(pos | neg)])
+
+    def merge(self, other):
+        """
+        Add the contents of another sketch with the same accuracy.
+
+        Parameters
+        ----------
+        other : GiniSketch
+        """
+
+        if other.alpha != self.alpha:
+            raise ValueError('Cannot merge sketches with different accuracy')
+
+        for buckets, other_buckets in ((self.positive, other.positive),
+                                       (self.negative, other.negative)):
+            for key, count in other_buckets.items():
+                buckets[key] = buckets.get(key, 0.0) + count
+        self.zero += other.zero
+
+    @property
+    def count(self):
+        """
+        Total weight of all values in the sketch
+        """
+        return sum(self.positive.values()) + sum(self.negative.values()) + self.zero
+
+    def values(self):
+        """
+        Return the representative values of all buckets and their weights,
+        sorted by value.
+
+        Returns
+        -------
+        x : numpy.ndarray
+        w : numpy.ndarray
+        """
+
+        def representative(buckets):
+            keys = np.array(list(buckets.keys()), dtype=float)
+            w = np.array(list(buckets.values()), dtype=float)
+            return 2 * self.gamma**keys / (self.gamma + 1), w
+
+        x_pos, w_pos = representative(self.positive)
+        x_neg, w_neg = representative(self.negative)
+
+        x = np.concatenate((-x_neg, [0.0], x_pos))
+        w = np.concatenate((w_neg, [self.zero], w_pos))
+
+        order = np.argsort(x)
+
+        return x[order], w[order]
+
+    def gini(self):
+        """
+        Approximate Gini coefficient of all values added to the sketch.
+        """
+
+        x, w = self.values()
+
+        return gini(x, weights=w, assume_sorted=True)
+
+    def quantile(self, q):
+        """
+        Approximate quantiles of all values added to the sketch.
+
+        Parameters
+        ----------
+        q : float or numpy.ndarray
+            Quantile levels
+
+        Returns
+        -------
+        float or numpy.ndarray
+        """
+
+        x, w = self.values()
+        F = np.cumsum(w) / np.sum(w)
+        i = np.searchsorted(F, q, side='left')
+
+        return x[np.minimum(i, len(x) - 1)]
+
+
+if __name__ == '__main__':
+
+    import time
+
+    def gini_sort(x):
+        # Original implementation in stats.gini()
+        x_sorted = np.sort(x)
+        N = len(x)
+        ii = np.arange(1, N+1)
+        return 2*np.sum(ii * x_sorted) / (N * np.sum(x_sorted)) - (N + 1) / N
+
+    rng = np.random.default_rng(seed=1234)
+
+    # Panel of T cross sections with N households each (lognormal wealth)
+    T, N = 100, 100_000
+    panel = rng.lognormal(mean=0.0, sigma=1.0, size=(T, N))
+
+    # Loop over periods with the original sort-based function
+    t0 = time.perf_counter()
+    G_loop = np.array([gini_sort(panel[t]) for t in range(T)])
+    t1 = time.perf_counter()
+    print(f'Loop over periods: {t1 - t0:.3f} sec.')
+
+    # Batched along axis
+    t0 = time.perf_counter()
+    G = gini(panel, axis=1)
+    t1 = time.perf_counter()
+    print(f'Batched: {t1 - t0:.3f} sec., max. difference {np.max(np.abs(G - G_loop)):.2e}')
+
+    # Weighted Gini with integer weights equals Gini of repeated values
+    x = panel[0, :1000]
+    w = rng.integers(1, 5, size=len(x))
+    print(f'Weighted vs. repeated values: '
+          f'{gini(x, weights=w) - gini(np.repeat(x, w)):.2e}')
+
+    # Negative net worth: Gini remains in [0, 1]
+    net_worth = panel[0] - 1.5
+    print(f'Gini with negative values: {gini(net_worth):.4f}')
+
+    # Sketch built from chunks of the panel and merged
+    t0 = time.perf_counter()
+    sketches = []
+    for chunk in np.array_split(panel[-1], 10):
+        sketch = GiniSketch(alpha=1.0e-3)
+        sketch.update(chunk)
+        sketches.append(sketch)
+    sketch = sketches[0]
+    for other in sketches[1:]:
+        sketch.merge(other)
+    t1 = time.perf_counter()
+    print(f'Sketch ({len(sketch.positive)} buckets, {t1 - t0:.3f} sec.): '
+          f'Gini error {sketch.gini() - G[-1]:.2e} '
+          f'(bound {2 * sketch.alpha / (1 - sketch.alpha):.2e})')
+
+    # Top and bottom shares of a large cross section. N is odd, so that
+    # p * N is not an integer and the share includes a fraction of the
+    # next observation.
+    x = rng.lognormal(mean=0.0, sigma=1.0, size=9_999_999)
+    p = np.array([0.5, 0.9, 0.99])
+
+    t0 = time.perf_counter()
+    x_sorted = np.sort(x)
+    x_cumsum = np.concatenate(([0.0], np.cumsum(x_sorted)))
+    k = np.floor(p * len(x)).astype(int)
+    L_sort = (x_cumsum[k] + (p * len(x) - k) * x_sorted[k]) / x_cumsum[-1]
+    t1 = time.perf_counter()
+    L = lorenz_shares(x, p)
+    t2 = time.perf_counter()
+    print(f'Bottom 50%, top 10% and top 1% shares for 10^7 values: sort {t1 - t0:.2f} sec., '
+          f'partition {t2 - t1:.2f} sec., max. difference {np.max(np.abs(L - L_sort)):.2e}')
+    print(f'Top 1% share: {1 - L[2]:.4f}, top 10% share: {1 - L[1]:.4f}, '
+          f'bottom 50% share: {L[0]:.4f}')
+
+    # Lorenz curve with 100 bins (sorted since there are many positions)
+    L = lorenz_shares(x, np.linspace(0.0, 1.0, 101))
+
+    # Batched over periods of a panel, with and without weights
+    shares = top_shares(panel, (0.01, 0.1), axis=1)
+    shares_w = top_shares(panel, (0.01, 0.1), axis=1, weights=np.ones(N))
+    print(f'Top shares of panel {shares.shape}: max. difference to weighted '
+          f'variant {np.max(np.abs(shares - shares_w)):.2e}')
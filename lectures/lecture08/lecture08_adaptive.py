@@ -0,0 +1,131 @@
+"""
+Lecture 8: Wealth simulations with an adaptive number of periods
+
+Instead of simulating a fixed number of periods, the simulation stops as
+soon as the cross-sectional mean and variance of wealth are close to their
+stationary values. If these are known in closed form (see
+compute_wealth_mean() and compute_wealth_var()), the simulated moments are
+compared to them. Otherwise, the simulation stops once the moments have
+been stable over a window of periods.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class AdaptiveSimulation:
+    """
+    Container to store the results of an adaptive simulation
+    """
+    a: np.ndarray = None        # Cross section of wealth in the last period
+    T: int = None               # Number of simulated periods
+    burn_in: int = None         # First period in which the stopping rule was met
+    converged: bool = None      # True if the stopping rule was met
+    mean: np.ndarray = None     # Cross-sectional mean in periods 0,...,T
+    var: np.ndarray = None      # Cross-sectional variance in periods 0,...,T
+
+
+def simulate_until_stationary(simulate, par, a0, N, targets=None, rtol=1.0e-2,
+                              window=20, max_T=1000, rng=None, **kwargs):
+    """
+    Simulate wealth until the cross-sectional distribution is approximately
+    stationary.
+
+    Parameters
+    ----------
+    simulate : callable
+        Streaming simulator with signature simulate(par, a0, T, N, rng, ...),
+        e.g. iter_wealth_ar1_income() or iter_wealth_iid_income().
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    N : int
+        Number of individuals to simulate.
+    targets : tuple of float, optional
+        Stationary mean and variance of wealth. If given, the simulation
+        stops in the first period in which both simulated moments are within
+        a relative tolerance of rtol of the targets. Otherwise, it stops once
+        the relative change of both moments over the last `window` periods
+        is below rtol.
+    rtol : float
+        Relative tolerance. This should be larger than the sampling error
+        of the moments for N households.
+    window : int
+        Number of periods over which moments have to be stable if no
+        targets are given.
+    max_T : int
+        Maximum number of periods to simulate.
+    rng : numpy.random.Generator, optional
+        A random number generator instance.
+    **kwargs
+        Additional arguments passed to `simulate` (e.g. chunk, dtype).
+
+    Returns
+    -------
+    AdaptiveSimulation
+    """
+
+    mean = np.empty(max_T+1)
+    var = np.empty(max_T+1)
+
+    converged = False
+    burn_in = None
+
+    for t, a in enumerate(simulate(par, a0, max_T, N, rng, **kwargs)):
+        mean[t] = np.mean(a)
+        var[t] = np.var(a)
+
+        if targets is not None:
+            # Distance to stationary moments
+            converged = (abs(mean[t] / targets[0] - 1) < rtol
+                         and abs(var[t] / targets[1] - 1) < rtol)
+            burn_in = t
+        elif t >= window:
+            # Max. relative change over the last `window` periods
+            change_mean = np.max(np.abs(mean[t-window:t] / mean[t] - 1))
+            change_var = np.max(np.abs(var[t-window:t] / var[t] - 1))
+            converged = change_mean < rtol and change_var < rtol
+            burn_in = t - window
+
+        # Stop simulating (no further shocks are drawn)
+        if converged:
+            break
+
+    if not converged:
+        print(f'Wealth distribution did not converge within {max_T} periods')
+        burn_in = None
+
+    return AdaptiveSimulation(
+        a=a, T=t, burn_in=burn_in, converged=converged,
+        mean=mean[:t+1], var=var[:t+1]
+    )
+
+
+if __name__ == '__main__':
+
+    import lecture08_iid_income as iid
+    import lecture08_ar1_income as ar1
+
+    a0 = 1.0
+    N = 100_000
+
+    # IID income: compare to stationary mean and variance
+    par = iid.Parameters()
+    targets = (iid.compute_wealth_mean(par), iid.compute_wealth_var(par))
+    res = simulate_until_stationary(iid.iter_wealth_iid_income, par, a0, N, targets)
+    print(f'IID income: stopped after {res.T} periods, '
+          f'mean = {res.mean[-1]:.4f} ({targets[0]:.4f}), var = {res.var[-1]:.4f} ({targets[1]:.4f})')
+
+    # AR(1) income: compare to stationary mean and variance
+    par = ar1.Parameters()
+    targets = (ar1.compute_wealth_mean(par), ar1.compute_wealth_var(par))
+    res = simulate_until_stationary(ar1.iter_wealth_ar1_income, par, a0, N, targets)
+    print(f'AR(1) income: stopped after {res.T} periods, '
+          f'mean = {res.mean[-1]:.4f} ({targets[0]:.4f}), var = {res.var[-1]:.4f} ({targets[1]:.4f})')
+
+    # AR(1) income without using the closed-form moments
+    res = simulate_until_stationary(ar1.iter_wealth_ar1_income, par, a0, N)
+    print(f'AR(1) income (stability over window): stopped after {res.T} periods, '
+          f'burn-in {res.burn_in} periods, mean = {res.mean[-1]:.4f}, var = {res.var[-1]:.4f}')
@@ -5,6 +5,7 @@ Lecture 8: Code for section on AR(1) processes
 
 import numpy as np
 import matplotlib.pyplot as plt 
+from scipy.signal import lfilter
 
 
 def simulate_ar1(x0, mu, rho, sigma, T, rng=None):
@@ -52,6 +53,254 @@ def simulate_ar1(x0, mu, rho, sigma, T, rng=None):
     return x
 
 
+def simulate_ar1_panel(x0, mu, rho, sigma, T, N, rng=None):
+    """
+    Simulate N independent realizations of an AR(1) process at once.
+
+    The shocks are drawn in the same order as in N sequential calls to
+    simulate_ar1() with the same generator, so both functions return the
+    same paths (up to rounding). Instead of looping over time in Python,
+    the recursion is applied to all paths at once using a linear filter.
+
+    Parameters
+    ----------
+    x0 : float or numpy.ndarray
+        The initial value of the process, either common to all paths or an
+        array of shape (N,) with one initial value per path.
+    mu : float
+        Intercept.
+    rho : float
+        The autoregressive parameter. For rho = 1, the process is a random
+        walk (with drift mu).
+    sigma : float
+        The standard deviation of the noise term.
+    T : int
+        The number of time periods to simulate.
+    N : int
+        The number of paths to simulate.
+    rng : Generator, optional
+        Random number generator to use.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (N, T+1) where each row contains one simulated
+        path of the AR(1) process.
+    """
+
+    # Create RNG instance
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    # Draw random shocks, one row per path
+    eps = rng.normal(loc=0, scale=sigma, size=(N, T))
+
+    # Initial values as column vector
+    x0 = np.broadcast_to(np.asarray(x0, dtype=float), (N, )).reshape((N, 1))
+
+    if rho == 1:
+        # Random walk: cumulative sum of shocks
+        x_next = x0 + np.cumsum(mu + eps, axis=1)
+    else:
+        # Apply x[t+1] = rho * x[t] + (mu + eps[t]) along the time axis,
+        # where the initial filter state rho * x0 carries the initial value
+        x_next, _ = lfilter([1.0], [1.0, -rho], mu + eps, axis=1, zi=rho * x0)
+
+    return np.hstack((x0, x_next))
+
+
+def sample_ar1_horizons(x0, mu, rho, sigma, horizons, N, rng=None):
+    """
+    Sample an AR(1) process at selected horizons without simulating the
+    periods in between.
+
+    Given x_t, the value h periods ahead is normally distributed with mean
+        mu * (1 - rho^h) / (1 - rho) + rho^h * x_t
+    and variance
+        sigma^2 * (1 - rho^(2h)) / (1 - rho^2),
+    so each horizon is drawn from its conditional distribution given the
+    previous horizon. The joint distribution across horizons is exact.
+
+    Parameters
+    ----------
+    x0 : float or numpy.ndarray
+        The initial value of the process, either common to all paths or an
+        array of shape (N,) with one initial value per path.
+    mu : float
+        Intercept.
+    rho : float
+        The autoregressive parameter (rho = 1 for a random walk).
+    sigma : float
+        The standard deviation of the noise term.
+    horizons : array_like
+        Increasing horizons (number of periods after period 0).
+    N : int
+        The number of paths to simulate.
+    rng : Generator, optional
+        Random number generator to use.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (N, k) with the values of each path at the k
+        horizons.
+    """
+
+    # Create RNG instance
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    horizons = np.asarray(horizons, dtype=int)
+    x = np.empty((N, len(horizons)))
+
+    x_prev = np.broadcast_to(np.asarray(x0, dtype=float), (N, ))
+    h_prev = 0
+
+    for i, h in enumerate(horizons):
+        # Number of periods since the previous horizon
+        g = h - h_prev
+
+        if rho == 1:
+            # Random walk: drift and variance grow linearly
+            mean = mu * g + x_prev
+            std = sigma * np.sqrt(g)
+        else:
+            mean = mu * (1 - rho**g) / (1 - rho) + rho**g * x_prev
+            std = sigma * np.sqrt((1 - rho**(2*g)) / (1 - rho**2))
+
+        x[:, i] = mean + std * rng.standard_normal(N)
+
+        x_prev, h_prev = x[:, i], h
+
+    return x
+
+
+def compute_linear_wealth_transition(mu, rho, sigma, b, g):
+    """
+    Compute the distribution of (x_{t+g}, a_{t+g}) given (x_t, a_t) for
+    the linear recursion
+        a_{t+1} = b * a_t + x_{t+1}
+    where x_t follows a Gaussian AR(1) process.
+
+    Wealth in t+g is a weighted sum of b^g * a_t and x_{t+1},...,x_{t+g},
+    which are all linear in x_t and the shocks, so (x_{t+g}, a_{t+g}) is
+    jointly normal given (x_t, a_t).
+
+    Parameters
+    ----------
+    mu : float
+        Intercept of the AR(1) process.
+    rho : float
+        The autoregressive parameter.
+    sigma : float
+        The standard deviation of the noise term.
+    b : float
+        Coefficient on current wealth (e.g. s * R).
+    g : int
+        Number of periods.
+
+    Returns
+    -------
+    A : numpy.ndarray
+        (2, 2) matrix such that the conditional mean is A @ (x_t, a_t) + c
+    c : numpy.ndarray
+        Constant of the conditional mean
+    cov : numpy.ndarray
+        (2, 2) conditional covariance matrix
+    """
+
+    j = np.arange(1, g+1)
+
+    # Mean of x_{t+j} for x_t = 0, and weight of x_{t+j} in a_{t+g}
+    m = mu * np.cumsum(rho**(j-1.0))
+    w = b**(g - j)
+
+    A = np.array([[rho**g, 0.0], [np.sum(w * rho**j), b**g]])
+    c = np.array([np.sum(m[-1:]), np.sum(w * m)])
+
+    # Loading of the shock in period t+i on x_{t+g} and on a_{t+g}, where the
+    # latter is sum_{k=0}^{g-i} b^(g-i-k) rho^k
+    load_x = rho**(g - j)
+    load_a = lfilter([1.0], [1.0, -b], rho**(j-1.0))[::-1]
+
+    load = np.vstack((load_x, load_a))
+    cov = sigma**2 * load @ load.T
+
+    return A, c, cov
+
+
+def sample_linear_wealth_horizons(x0, a0, mu, rho, sigma, b, horizons, N, rng=None):
+    """
+    Sample wealth at selected horizons for the linear recursion
+        a_{t+1} = b * a_t + x_{t+1}
+    where income x_t follows a Gaussian AR(1) process, without simulating
+    the periods in between.
+
+    The joint distribution of income and wealth at each horizon given their
+    values at the previous horizon is normal (see
+    compute_linear_wealth_transition()). This does not apply to log-normal
+    income as in lecture08_ar1_income, since sums of log-normal variables
+    are not log-normal; such models need to be simulated period by period.
+
+    Parameters
+    ----------
+    x0 : float or numpy.ndarray
+        Initial income, common to all paths or of shape (N,).
+    a0 : float or numpy.ndarray
+        Initial wealth, common to all paths or of shape (N,).
+    mu : float
+        Intercept of the AR(1) process.
+    rho : float
+        The autoregressive parameter.
+    sigma : float
+        The standard deviation of the noise term.
+    b : float
+        Coefficient on current wealth (e.g. s * R).
+    horizons : array_like
+        Increasing horizons (number of periods after period 0).
+    N : int
+        The number of paths to simulate.
+    rng : Generator, optional
+        Random number generator to use.
+
+    Returns
+    -------
+    x : numpy.ndarray
+        An array of shape (N, k) with income at the k horizons.
+    a : numpy.ndarray
+        An array of shape (N, k) with wealth at the k horizons.
+    """
+
+    # Create RNG instance
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    horizons = np.asarray(horizons, dtype=int)
+    x = np.empty((N, len(horizons)))
+    a = np.empty((N, len(horizons)))
+
+    # Current state (x, a), one row per path
+    state = np.empty((N, 2))
+    state[:, 0] = x0
+    state[:, 1] = a0
+    h_prev = 0
+
+    for i, h in enumerate(horizons):
+        A, c, cov = compute_linear_wealth_transition(mu, rho, sigma, b, h - h_prev)
+
+        # Matrix square root of the covariance (which is singular for g = 1,
+        # when both variables load on the same shock)
+        eigval, eigvec = np.linalg.eigh(cov)
+        root = eigvec * np.sqrt(np.maximum(eigval, 0.0))
+
+        state = state @ A.T + c + rng.standard_normal((N, 2)) @ root.T
+
+        x[:, i], a[:, i] = state[:, 0], state[:, 1]
+        h_prev = h
+
+    return x, a
+
+
 if __name__ == '__main__':
     """
     Run code for AR(1) section
@@ -95,12 +344,8 @@ if __name__ == '__main__':
     # Simulate 20 different sequences
     N = 20
 
-    # Create an array to store the simulated values
-    data = np.zeros((N, T+1))
-
-    # Simulate the AR(1) process N times
-    for i in range(N):
-        data[i, :] = simulate_ar1(x0, mu, rho, sigma, T, rng)
+    # Simulate the AR(1) process N times at once
+    data = simulate_ar1_panel(x0, mu, rho, sigma, T, N, rng)
 
     plt.figure(figsize=(7, 4))
     plt.plot(data.T, alpha=0.75, lw=0.75)
@@ -109,3 +354,39 @@ if __name__ == '__main__':
     # Add unconditional mean
     plt.axhline(uncond_mean, color='black', linestyle='--', lw=0.5, label='Mean')
     plt.show()
+
+    # --- Sample AR(1) process at selected horizons only ---
+
+    import time
+
+    N = 100_000
+    T = 300
+    horizons = [10, 50, 300]
+
+    t0 = time.perf_counter()
+    x_sim = simulate_ar1_panel(x0, mu, rho, sigma, T, N, rng)[:, horizons]
+    t1 = time.perf_counter()
+    x_skip = sample_ar1_horizons(x0, mu, rho, sigma, horizons, N, rng)
+    t2 = time.perf_counter()
+    print(f'Panel simulation: {t1 - t0:.2f} sec., skip-ahead sampling: {t2 - t1:.2f} sec.')
+
+    for i, h in enumerate(horizons):
+        var_exact = sigma**2 * (1 - rho**(2*h)) / (1 - rho**2)
+        print(f'h = {h:3d}: variance simulated {np.var(x_sim[:, i]):.5f}, '
+              f'skip-ahead {np.var(x_skip[:, i]):.5f}, exact {var_exact:.5f}')
+
+    # --- Sample wealth a' = b * a + x' with Gaussian AR(1) income ---
+
+    b = 0.9
+    mu_x = 0.1
+    x_sim = simulate_ar1_panel(1.0, mu_x, rho, sigma, T, N, rng)
+    a_sim = lfilter([1.0], [1.0, -b], x_sim[:, 1:], axis=1, zi=np.full((N, 1), b))[0]
+    x_skip, a_skip = sample_linear_wealth_horizons(1.0, 1.0, mu_x, rho, sigma, b, horizons, N, rng)
+
+    for i, h in enumerate(horizons):
+        cov_sim = np.cov(x_sim[:, h], a_sim[:, h-1])
+        cov_skip = np.cov(x_skip[:, i], a_skip[:, i])
+        print(f'h = {h:3d}: mean wealth simulated {np.mean(a_sim[:, h-1]):.4f}, '
+              f'skip-ahead {np.mean(a_skip[:, i]):.4f}; '
+              f'var {cov_sim[1, 1]:.4f} vs. {cov_skip[1, 1]:.4f}; '
+              f'cov(x, a) {cov_sim[0, 1]:.4f} vs. {cov_skip[0, 1]:.4f}')
@@ -4,7 +4,8 @@ Lecture 8: Code for wealth dynamics with AR(1) income
 
 import numpy as np
 import matplotlib.pyplot as plt
-from stats import gini
+from stats import gini, stream_stats, stack_stats
+from lecture08_sampling import pseudo_normal
 from dataclasses import dataclass
 
 
@@ -70,6 +71,96 @@ def simulate_wealth_ar1_income(par: Parameters, a0, T, N, rng=None):
     return a_sim
 
 
+def iter_wealth_ar1_income(par: Parameters, a0, T, N, rng=None, chunk=10,
+                           dtype=np.float64, reuse=False, sampler=pseudo_normal):
+    """
+    Simulate the evolution of wealth over time if income follows an AR(1),
+    yielding one cross section at a time.
+
+    Only the current cross section is kept in memory, and AR(1) innovations
+    are drawn for `chunk` periods at a time. All intermediate results are
+    computed in place in preallocated buffers. For dtype=np.float64, the
+    random draws (and thus the results) are identical to those of
+    simulate_wealth_ar1_income().
+
+    Parameters
+    ----------
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    rng : numpy.random.Generator, optional
+        A random number generator instance.
+    chunk : int
+        Number of periods for which innovations are drawn at once.
+    dtype : numpy.dtype
+        Floating-point type used for storage, random draws and arithmetic.
+        np.float32 halves memory use but uses a different random stream.
+    reuse : bool
+        If True, the same array is yielded in every period and overwritten
+        in the next period, so no memory is allocated after the first
+        period. Copy the array if it needs to be kept.
+    sampler : callable
+        Function sampler(rng, out) which fills an array of shape (n, N) with
+        standard normal draws (see lecture08_sampling). Defaults to
+        pseudo-random draws.
+
+    Yields
+    ------
+    a : numpy.ndarray
+        Array of shape (N,) with the wealth of each household in periods
+        0,...,T.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    # Parameters as scalars of the requested type, so that arithmetic is
+    # not promoted to a wider type
+    dtype = np.dtype(dtype)
+    s, R, mu_y, rho, sigma_eps = (dtype.type(v) for v in (par.s, par.R, par.mu_y, par.rho, par.sigma_eps))
+
+    # Compute mean log income
+    log_y_mean = par.mu_y/(1-par.rho)
+
+    # Assume that all individuals start with the same income
+    log_y = np.full(N, fill_value=log_y_mean, dtype=dtype)
+
+    # Buffers for innovations and income in levels
+    epsilon_buffer = np.empty((min(chunk, T), N), dtype=dtype)
+    y = np.empty(N, dtype=dtype)
+
+    # Initial value (identical for all households)
+    a = np.full(N, fill_value=a0, dtype=dtype)
+    yield a
+
+    for t in range(T):
+        # Random draws of AR(1) innovations for the next chunk of periods
+        if t % chunk == 0:
+            epsilon = epsilon_buffer[:min(chunk, T-t)]
+            sampler(rng, epsilon)
+            epsilon *= sigma_eps
+
+        # Log income next period: mu_y + rho * log_y + epsilon
+        log_y *= rho
+        log_y += mu_y
+        log_y += epsilon[t % chunk]
+
+        # Income in levels
+        np.exp(log_y, out=y)
+
+        # Next-period assets: R * (s * a) + y
+        a_next = a if reuse else np.empty_like(a)
+        np.multiply(a, s, out=a_next)
+        a_next *= R
+        a_next += y
+        a = a_next
+
+        yield a
+
 
 def compute_wealth_mean(par):
     """
@@ -102,6 +193,47 @@ def compute_wealth_mean(par):
     return a_mean
 
 
+def compute_wealth_var(par):
+    """
+    Compute the variance of the stationary wealth distribution assuming
+    income follows an AR(1) process.
+
+    Stationary wealth is a = sum_h (s*R)^h y_{t-h}, and the autocovariance
+    of lognormal income at lag h is E[y]^2 * (exp(rho^h * sigma^2) - 1),
+    where sigma^2 is the unconditional variance of log income. Hence
+        Var(a) = E[y]^2 / (1 - b^2) * [(exp(sigma^2) - 1)
+                    + 2 * sum_{h>=1} b^h * (exp(rho^h * sigma^2) - 1)]
+    with b = s*R. The infinite sum is truncated once b^h < 1e-16.
+
+    Parameters
+    ----------
+    par : Parameters
+
+    Returns
+    -------
+    float
+        The variance of the stationary wealth distribution.
+    """
+
+    b = par.s * par.R
+
+    # Unconditional mean and variance of AR(1) log income
+    log_y_mean = par.mu_y / (1 - par.rho)
+    log_y_var = par.sigma_eps**2 / (1 - par.rho**2)
+
+    # Mean of income (in levels)
+    y_mean = np.exp(log_y_mean + log_y_var/2)
+
+    # Lags with non-negligible weight
+    h = np.arange(1, int(np.ceil(np.log(1.0e-16) / np.log(b))) + 1)
+    autocov = np.sum(b**h * np.expm1(par.rho**h * log_y_var))
+
+    # Variance of wealth
+    a_var = y_mean**2 / (1 - b**2) * (np.expm1(log_y_var) + 2 * autocov)
+
+    return a_var
+
+
 if __name__ == '__main__':
     """
     Run all code for wealth dynamics with AR(1) income
@@ -170,8 +302,9 @@ if __name__ == '__main__':
     # Cross-sectional variance of simulated time series
     a_sim_var = np.var(a_sim, axis=1)
 
-    # Compute analytical mean
+    # Compute analytical mean and variance
     a_mean_exact = compute_wealth_mean(par)
+    a_var_exact = compute_wealth_var(par)
 
     # Plot cross-sectional mean and variance
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 3), sharex=True)
@@ -183,7 +316,8 @@ if __name__ == '__main__':
     ax1.set_title('Cross-sectional mean of wealth')
     ax1.legend(loc='lower right')
 
-    # Plot simulated variance
+    # Plot simulated vs. analytical variance
+    ax2.axhline(a_var_exact, color='black', ls='--', lw=1, label='Exact')
     ax2.plot(a_sim_var, lw=1, label='Simulated')
     ax2.set_title('Cross-sectional variance of wealth')
     ax2.set_xlabel('Period')
@@ -195,3 +329,17 @@ if __name__ == '__main__':
 
     G = gini(last_cross_section)
     print(f'Wealth Gini coefficient: {G:.3f}')
+
+    # --- Stream cross-sectional statistics instead of storing all paths ---
+
+    # Create RNG instance
+    rng = np.random.default_rng(seed=1234)
+
+    # Statistics for each period, keeping only the current cross section
+    stats = stack_stats(stream_stats(iter_wealth_ar1_income(par, a0, T, N, rng)))
+
+    print(f'Max. difference in mean vs. full simulation: '
+          f'{np.max(np.abs(stats.mean - a_sim_mean)):.3e}')
+    print(f'Wealth Gini coefficient in last period: {stats.gini[-1]:.3f}')
+    print(f'Wealth share of top 1%: {stats.top_shares[-1, 0]:.3f}, '
+          f'top 10%: {stats.top_shares[-1, 1]:.3f}')
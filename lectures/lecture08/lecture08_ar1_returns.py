@@ -0,0 +1,248 @@
+"""
+Lecture 8: Code for wealth dynamics with AR(1) income and AR(1) returns
+
+Wealth evolves according to
+    a_{t+1} = R_{t+1} * s * a_t + y_{t+1}
+where log income and log gross returns follow AR(1) processes with
+(optionally) correlated innovations. Households are simulated at once in
+vectorized form, and shocks are drawn in chunks of periods so that long
+simulations of many households only require memory for the current cross
+section. With rho_y = 0 and no correlation, this is the model with IID
+income and AR(1) returns from workshop 8.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+from dataclasses import dataclass
+
+from stats import stream_stats, stack_stats
+from lecture08_sampling import pseudo_normal
+
+
+@dataclass
+class Parameters:
+    """
+    Container to store model parameters
+    """
+    s: float = 0.75                             # Exogenous savings rate
+    sigma_y: float = 0.1                        # Conditional standard deviation of log income
+    rho_y: float = 0.0                          # Persistence of log income
+    mu_y: float = -sigma_y**2.0/2.0             # Intercept of log income
+    rho_r: float = 0.6                          # Persistence of log gross returns
+    sigma_r: float = 0.2                        # Conditional standard deviation of log gross returns
+    mu_r: float = (1-rho_r) * np.log(1.1) - sigma_r**2/2/(1+rho_r)    # Intercept of log gross returns
+    corr: float = 0.0                           # Correlation of income and return innovations
+
+
+def iter_wealth_ar1_returns(par: Parameters, a0, T, N, rng=None, chunk=10,
+                            dtype=np.float64, reuse=False, sampler=pseudo_normal):
+    """
+    Simulate the evolution of wealth with AR(1) income and AR(1) returns,
+    yielding one cross section at a time.
+
+    For each chunk of periods, standard normal draws for income are drawn
+    first, followed by those for returns. Results therefore depend on the
+    chunk size. With chunk >= T, rho_y = 0 and corr = 0, the draws are the
+    same as in simulate_wealth() from workshop 8.
+
+    Parameters
+    ----------
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    rng : numpy.random.Generator, optional
+        A random number generator instance.
+    chunk : int
+        Number of periods for which innovations are drawn at once.
+    dtype : numpy.dtype
+        Floating-point type used for storage, random draws and arithmetic.
+    reuse : bool
+        If True, the same array is yielded in every period and overwritten
+        in the next period. Copy the array if it needs to be kept.
+    sampler : callable
+        Function sampler(rng, out) which fills an array of shape (n, N) with
+        standard normal draws (see lecture08_sampling). Defaults to
+        pseudo-random draws.
+
+    Yields
+    ------
+    a : numpy.ndarray
+        Array of shape (N,) with the wealth of each household in periods
+        0,...,T.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    # Parameters as scalars of the requested type
+    dtype = np.dtype(dtype)
+    s, mu_y, rho_y, sigma_y, mu_r, rho_r, sigma_r = (
+        dtype.type(v) for v in
+        (par.s, par.mu_y, par.rho_y, par.sigma_y, par.mu_r, par.rho_r, par.sigma_r)
+    )
+
+    # Initial values of log income and log returns: unconditional means
+    log_y = np.full(N, fill_value=par.mu_y / (1 - par.rho_y), dtype=dtype)
+    log_R = np.full(N, fill_value=par.mu_r / (1 - par.rho_r), dtype=dtype)
+
+    # Buffers for innovations and for income and returns in levels
+    eps_y_buffer = np.empty((min(chunk, T), N), dtype=dtype)
+    eps_R_buffer = np.empty((min(chunk, T), N), dtype=dtype)
+    y = np.empty(N, dtype=dtype)
+    R = np.empty(N, dtype=dtype)
+
+    # Initial wealth (identical for all households)
+    a = np.full(N, fill_value=a0, dtype=dtype)
+    yield a
+
+    for t in range(T):
+        # Random draws of innovations for the next chunk of periods
+        if t % chunk == 0:
+            n = min(chunk, T-t)
+            eps_y = eps_y_buffer[:n]
+            eps_R = eps_R_buffer[:n]
+            sampler(rng, eps_y)
+            sampler(rng, eps_R)
+            if par.corr != 0:
+                # Correlated innovations: corr * z_y + sqrt(1 - corr^2) * z_R
+                eps_R *= dtype.type(np.sqrt(1 - par.corr**2))
+                eps_R += dtype.type(par.corr) * eps_y
+            eps_y *= sigma_y
+            eps_R *= sigma_r
+
+        # Log income next period: mu_y + rho_y * log_y + eps_y
+        log_y *= rho_y
+        log_y += mu_y
+        log_y += eps_y[t % chunk]
+        np.exp(log_y, out=y)
+
+        # Log gross returns next period: mu_r + rho_r * log_R + eps_R
+        log_R *= rho_r
+        log_R += mu_r
+        log_R += eps_R[t % chunk]
+        np.exp(log_R, out=R)
+
+        # Next-period assets: R * (s * a) + y
+        a_next = a if reuse else np.empty_like(a)
+        np.multiply(a, s, out=a_next)
+        a_next *= R
+        a_next += y
+        a = a_next
+
+        yield a
+
+
+def simulate_wealth_ar1_returns(par: Parameters, a0, T, N, rng=None):
+    """
+    Simulate the evolution of wealth with AR(1) income and AR(1) returns
+    and return all wealth paths.
+
+    Parameters
+    ----------
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    rng : numpy.random.Generator, optional
+        A random number generator instance.
+
+    Returns
+    -------
+    a_sim : numpy.ndarray
+        A (T+1, N) array where each column represents the simulated wealth path of a household.
+    """
+
+    a_sim = np.empty((T+1, N))
+
+    # Draw all shocks at once (same draws as in workshop 8)
+    for t, a in enumerate(iter_wealth_ar1_returns(par, a0, T, N, rng, chunk=max(T, 1))):
+        a_sim[t] = a
+
+    return a_sim
+
+
+def compute_return_mean(par):
+    """
+    Compute the unconditional mean of gross returns.
+
+    Parameters
+    ----------
+    par : Parameters
+
+    Returns
+    -------
+    float
+    """
+
+    # Unconditional mean and variance of AR(1) log returns
+    log_R_mean = par.mu_r / (1 - par.rho_r)
+    log_R_var = par.sigma_r**2 / (1 - par.rho_r**2)
+
+    # Mean of log-normal gross returns
+    R_mean = np.exp(log_R_mean + log_R_var/2)
+
+    return R_mean
+
+
+if __name__ == '__main__':
+    """
+    Run all code for wealth dynamics with AR(1) returns
+    """
+
+    import time
+
+    par = Parameters()
+
+    print(f'Mean gross return: {compute_return_mean(par):.3f}')
+
+    # Initial wealth (identical for all households)
+    a0 = 1.0
+
+    # --- Simulate wealth trajectories for 20 households ---
+
+    T = 100
+    N = 20
+
+    a_sim = simulate_wealth_ar1_returns(par, a0, T, N)
+
+    plt.figure(figsize=(7, 4))
+    plt.plot(a_sim, alpha=0.75, lw=0.75)
+    plt.plot(np.mean(a_sim, axis=1), color='black', ls='-', lw=1.25, label='Mean of simulations')
+    plt.xlabel('Period')
+    plt.ylabel('Wealth')
+    plt.title('Simulated wealth paths with AR(1) returns')
+    plt.legend(loc='upper left')
+    plt.show()
+
+    # --- Stream statistics for 1,000,000 households ---
+
+    T = 200
+    N = 1_000_000
+
+    t0 = time.perf_counter()
+    stats = stack_stats(stream_stats(iter_wealth_ar1_returns(par, a0, T, N, reuse=True)))
+    t1 = time.perf_counter()
+    print(f'Simulated {N} households for {T} periods in {t1 - t0:.1f} sec.')
+
+    # Plot cross-sectional mean, variance and Gini of the last 100 periods
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(10, 3))
+    ax1.plot(stats.mean, lw=1)
+    ax1.set_title('Cross-sectional mean of wealth')
+    ax1.set_xlabel('Period')
+    ax2.plot(stats.var, lw=1)
+    ax2.set_title('Cross-sectional variance of wealth')
+    ax2.set_xlabel('Period')
+    periods = np.arange(T-99, T+1)
+    ax3.plot(periods, stats.gini[-100:], lw=1)
+    ax3.axhline(np.mean(stats.gini[-100:]), color='black', ls='--', lw=1, label='Average')
+    ax3.set_title('Gini coefficient')
+    ax3.set_xlabel('Period')
+    ax3.legend()
+    plt.show()
@@ -0,0 +1,315 @@
+"""
+Lecture 8: Wealth distribution with the histogram method
+
+Instead of simulating many households, this module iterates the joint
+distribution of wealth and income forward on a grid. Log income is
+discretized with the Rouwenhorst method, and next-period wealth, which
+usually lies between two grid points, is assigned to the two neighboring
+grid points with probabilities that preserve its mean (lottery method of
+Young, 2010). The resulting transition operator is a sparse matrix which
+can be reused to compute the stationary distribution or transition
+dynamics from any initial distribution.
+
+IID income is the special case rho = 0.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse
+
+from inequality import gini
+from markov import rouwenhorst
+
+
+@dataclass
+class DistributionOperator:
+    """
+    Container to store the grids and the transition operator of the joint
+    distribution of wealth and income
+    """
+    a_grid: np.ndarray = None       # Wealth grid
+    y_grid: np.ndarray = None       # Income grid (in levels)
+    Pi: np.ndarray = None           # Transition matrix of income states
+    Lambda: scipy.sparse.csr_matrix = None  # Maps distribution in t to t+1
+
+
+def discretize_income(par, n_y=21):
+    """
+    Discretize log income using the Rouwenhorst method.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters of the AR(1) income model (mu_y, rho, sigma_eps) or of
+        the IID income model (mu_y, sigma_y).
+    n_y : int
+        Number of income states
+
+    Returns
+    -------
+    y_grid : numpy.ndarray
+        Income states (in levels)
+    Pi : numpy.ndarray
+        Transition matrix of income states
+    """
+
+    if hasattr(par, 'rho'):
+        # AR(1) income: unconditional mean of log income
+        log_y, Pi = rouwenhorst(n_y, par.mu_y / (1 - par.rho), par.rho, par.sigma_eps)
+    else:
+        # IID income is an AR(1) without persistence
+        log_y, Pi = rouwenhorst(n_y, par.mu_y, 0.0, par.sigma_y)
+
+    return np.exp(log_y), Pi
+
+
+def lottery(x, grid):
+    """
+    Assign values to the two neighboring grid points.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Values to assign (clipped to the range of the grid)
+    grid : numpy.ndarray
+        Increasing grid
+
+    Returns
+    -------
+    i : numpy.ndarray
+        Index of the lower grid point
+    w : numpy.ndarray
+        Probability assigned to the lower grid point
+    """
+
+    x = np.clip(x, grid[0], grid[-1])
+
+    i = np.searchsorted(grid, x, side='right') - 1
+    i = np.clip(i, 0, len(grid) - 2)
+
+    w = (grid[i+1] - x) / (grid[i+1] - grid[i])
+
+    return i, w
+
+
+def create_operator(par, a0=None, n_a=1000, n_y=21):
+    """
+    Create the transition operator of the joint distribution of wealth and
+    income.
+
+    The distribution is a vector of length n_a * n_y, where element
+    i * n_y + j is the mass of households with wealth a_grid[i] and income
+    y_grid[j].
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters of the AR(1) income model or of the IID income model.
+    a0 : float, optional
+        Initial wealth which should be included in the grid.
+    n_a : int
+        Number of wealth grid points
+    n_y : int
+        Number of income states
+
+    Returns
+    -------
+    DistributionOperator
+    """
+
+    y_grid, Pi = discretize_income(par, n_y)
+
+    # Wealth a' = s * R * a + y' remains in [y_min, y_max] / (1 - s * R)
+    b = par.s * par.R
+    a_min, a_max = y_grid[0] / (1 - b), y_grid[-1] / (1 - b)
+    if a0 is not None:
+        a_min, a_max = min(a_min, a0), max(a_max, a0)
+    a_grid = np.linspace(a_min, a_max, n_a)
+
+    # Next-period wealth for each current wealth and next-period income,
+    # array of shape (n_a, n_y)
+    a_next = b * a_grid[:, None] + y_grid[None, :]
+    i_next, w_next = lottery(a_next, a_grid)
+
+    # Transition from (i, j) to (i_next[i, k], k) and (i_next[i, k] + 1, k)
+    # with probabilities Pi[j, k] * w and Pi[j, k] * (1 - w)
+    i, j, k = np.meshgrid(np.arange(n_a), np.arange(n_y), np.arange(n_y), indexing='ij')
+    src = i * n_y + j
+    dst = i_next[i, k] * n_y + k
+    prob = Pi[j, k]
+    w = w_next[i, k]
+
+    # Store transpose so that the distribution is updated as D' = Lambda @ D
+    Lambda = scipy.sparse.csr_matrix(
+        (
+            np.concatenate((prob * w, prob * (1 - w)), axis=None),
+            (np.concatenate((dst, dst + n_y), axis=None),
+             np.concatenate((src, src), axis=None))
+        ),
+        shape=(n_a * n_y, n_a * n_y)
+    )
+
+    return DistributionOperator(a_grid=a_grid, y_grid=y_grid, Pi=Pi, Lambda=Lambda)
+
+
+def initial_distribution(op: DistributionOperator, a0):
+    """
+    Create the distribution where all households have wealth a0 and median
+    income.
+
+    Parameters
+    ----------
+    op : DistributionOperator
+    a0 : float
+        Initial wealth
+
+    Returns
+    -------
+    D : numpy.ndarray
+        Distribution vector of length n_a * n_y
+    """
+
+    n_a, n_y = len(op.a_grid), len(op.y_grid)
+
+    i, w = lottery(np.array(a0), op.a_grid)
+
+    D = np.zeros((n_a, n_y))
+    D[i, n_y // 2] = w
+    D[i+1, n_y // 2] += 1 - w
+
+    return D.ravel()
+
+
+def iterate_distribution(op: DistributionOperator, D0, T):
+    """
+    Iterate the distribution forward for T periods.
+
+    Parameters
+    ----------
+    op : DistributionOperator
+    D0 : numpy.ndarray
+        Initial distribution
+    T : int
+        Number of periods
+
+    Returns
+    -------
+    D : numpy.ndarray
+        Array of shape (T+1, n_a * n_y) with the distribution in each period
+    """
+
+    D = np.empty((T+1, len(D0)))
+    D[0] = D0
+
+    for t in range(T):
+        D[t+1] = op.Lambda @ D[t]
+
+    return D
+
+
+def compute_stationary_distribution(op: DistributionOperator, D0=None, tol=1.0e-12,
+                                    maxiter=100_000):
+    """
+    Compute the stationary distribution by iterating the distribution
+    forward until it converges.
+
+    Parameters
+    ----------
+    op : DistributionOperator
+    D0 : numpy.ndarray, optional
+        Initial guess. Defaults to the uniform distribution.
+    tol : float
+        Tolerance on the max. absolute change in the distribution
+    maxiter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    D : numpy.ndarray
+        Stationary distribution
+    """
+
+    if D0 is None:
+        D0 = np.full(op.Lambda.shape[0], 1 / op.Lambda.shape[0])
+
+    D = D0
+    for it in range(maxiter):
+        D_next = op.Lambda @ D
+        if np.max(np.abs(D_next - D)) < tol:
+            break
+        D = D_next
+    else:
+        print('Distribution iteration did not terminate successfully')
+
+    return D_next
+
+
+def compute_wealth_moments(op: DistributionOperator, D):
+    """
+    Compute the mean, variance and Gini coefficient of wealth.
+
+    Parameters
+    ----------
+    op : DistributionOperator
+    D : numpy.ndarray
+        Distribution vector, or array of shape (T+1, n_a * n_y) with one
+        distribution per period
+
+    Returns
+    -------
+    a_mean : float or numpy.ndarray
+    a_var : float or numpy.ndarray
+    a_gini : float or numpy.ndarray
+    """
+
+    n_a, n_y = len(op.a_grid), len(op.y_grid)
+
+    # Marginal distribution of wealth
+    D = np.asarray(D)
+    p = D.reshape(D.shape[:-1] + (n_a, n_y)).sum(axis=-1)
+
+    a_mean = p @ op.a_grid
+    a_var = p @ op.a_grid**2 - a_mean**2
+
+    # Gini coefficient for each distribution at once
+    a_gini = gini(op.a_grid, weights=p)
+
+    return a_mean, a_var, a_gini
+
+
+if __name__ == '__main__':
+
+    import time
+    from lecture08_ar1_income import (
+        Parameters, simulate_wealth_ar1_income, compute_wealth_mean
+    )
+
+    par = Parameters()
+    a0 = 1.0
+    T = 100
+
+    # Stationary distribution with the histogram method
+    t0 = time.perf_counter()
+    op = create_operator(par, a0)
+    D = compute_stationary_distribution(op)
+    a_mean, a_var, a_gini = compute_wealth_moments(op, D)
+    t1 = time.perf_counter()
+    print(f'Histogram method ({t1 - t0:.2f} sec.): '
+          f'mean = {a_mean:.4f}, var = {a_var:.4f}, Gini = {a_gini:.4f}')
+
+    # Transition dynamics from identical initial wealth
+    D_path = iterate_distribution(op, initial_distribution(op, a0), T)
+    mean_path, var_path, gini_path = compute_wealth_moments(op, D_path)
+    print(f'Histogram method after {T} periods: mean = {mean_path[-1]:.4f}, '
+          f'var = {var_path[-1]:.4f}, Gini = {gini_path[-1]:.4f}')
+
+    # Compare to simulation
+    t0 = time.perf_counter()
+    a_sim = simulate_wealth_ar1_income(par, a0, T, N=1_000_000)
+    t1 = time.perf_counter()
+    print(f'Simulation with 10^6 households ({t1 - t0:.2f} sec.): '
+          f'mean = {np.mean(a_sim[-1]):.4f}, var = {np.var(a_sim[-1]):.4f}, '
+          f'Gini = {gini(a_sim[-1]):.4f}')
+
+    print(f'Exact stationary mean: {compute_wealth_mean(par):.4f}')
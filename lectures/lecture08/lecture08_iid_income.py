@@ -5,7 +5,8 @@ Lecture 8: Code for wealth dynamics with iid income
 import numpy as np
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
-from stats import gini
+from stats import gini, stream_stats, stack_stats
+from lecture08_sampling import pseudo_normal
 
 
 @dataclass
@@ -66,6 +67,85 @@ def simulate_wealth_iid_income(par: Parameters, a0, T, N, rng=None):
     return a_sim
 
 
+def iter_wealth_iid_income(par: Parameters, a0, T, N, rng=None, chunk=10,
+                           dtype=np.float64, reuse=False, sampler=pseudo_normal):
+    """
+    Simulate the evolution of wealth over time when income is IID, yielding
+    one cross section at a time.
+
+    Only the current cross section is kept in memory, and income is drawn
+    for `chunk` periods at a time. All intermediate results are computed in
+    place in preallocated buffers. For dtype=np.float64, the random draws
+    (and thus the results) are identical to those of
+    simulate_wealth_iid_income().
+
+    Parameters
+    ----------
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    rng : numpy.random.Generator, optional
+        A random number generator instance.
+    chunk : int
+        Number of periods for which income is drawn at once.
+    dtype : numpy.dtype
+        Floating-point type used for storage, random draws and arithmetic.
+        np.float32 halves memory use but uses a different random stream.
+    reuse : bool
+        If True, the same array is yielded in every period and overwritten
+        in the next period, so no memory is allocated after the first
+        period. Copy the array if it needs to be kept.
+    sampler : callable
+        Function sampler(rng, out) which fills an array of shape (n, N) with
+        standard normal draws (see lecture08_sampling). Defaults to
+        pseudo-random draws.
+
+    Yields
+    ------
+    a : numpy.ndarray
+        Array of shape (N,) with the wealth of each household in periods
+        0,...,T.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng(seed=1234)
+
+    # Parameters as scalars of the requested type, so that arithmetic is
+    # not promoted to a wider type
+    dtype = np.dtype(dtype)
+    s, R, mu_y, sigma_y = (dtype.type(v) for v in (par.s, par.R, par.mu_y, par.sigma_y))
+
+    # Buffer for income draws
+    y_buffer = np.empty((min(chunk, T), N), dtype=dtype)
+
+    # Initial value (identical for all households)
+    a = np.full(N, fill_value=a0, dtype=dtype)
+    yield a
+
+    for t in range(T):
+        # Random draws of IID income for the next chunk of periods,
+        # exponentiated in place
+        if t % chunk == 0:
+            y = y_buffer[:min(chunk, T-t)]
+            sampler(rng, y)
+            y *= sigma_y
+            y += mu_y
+            np.exp(y, out=y)
+
+        # Next-period assets: R * (s * a) + y
+        a_next = a if reuse else np.empty_like(a)
+        np.multiply(a, s, out=a_next)
+        a_next *= R
+        a_next += y[t % chunk]
+        a = a_next
+
+        yield a
+
+
 def compute_wealth_mean(par):
     """
     Compute the mean of the stationary wealth distribution assuming iid income.
@@ -212,3 +292,17 @@ if __name__ == '__main__':
     # Compute and print the Gini coefficient
     G = gini(last_cross_section)
     print(f'Wealth Gini coefficient: {G:.3f}')
+
+    # --- Stream cross-sectional statistics instead of storing all paths ---
+
+    # Create RNG instance
+    rng = np.random.default_rng(seed=1234)
+
+    # Statistics for each period, keeping only the current cross section
+    stats = stack_stats(stream_stats(iter_wealth_iid_income(par, a0, T, N, rng)))
+
+    print(f'Max. difference in mean vs. full simulation: '
+          f'{np.max(np.abs(stats.mean - a_sim_mean)):.3e}')
+    print(f'Wealth Gini coefficient in last period: {stats.gini[-1]:.3f}')
+    print(f'Wealth share of top 1%: {stats.top_shares[-1, 0]:.3f}, '
+          f'top 10%: {stats.top_shares[-1, 1]:.3f}')
@@ -0,0 +1,155 @@
+"""
+Lecture 8: Parallel simulation of wealth dynamics
+
+Households are split into shards of a fixed size which are simulated in a
+pool of worker processes. Each shard uses its own random number stream
+created with SeedSequence.spawn(), and per-period moments of the shards are
+merged in a fixed order. Results therefore only depend on the seed and the
+shard size, but not on the number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from lecture08_ar1_income import iter_wealth_ar1_income
+
+
+@dataclass
+class WealthMoments:
+    """
+    Container to store cross-sectional moments of wealth in each period
+    """
+    n: int = None               # Number of households
+    mean: np.ndarray = None     # Cross-sectional mean, shape (T+1,)
+    M2: np.ndarray = None       # Sum of squared deviations from mean, shape (T+1,)
+
+    @property
+    def var(self):
+        """
+        Cross-sectional variance (same normalization as np.var())
+        """
+        return self.M2 / self.n
+
+
+def merge_moments(m1: WealthMoments, m2: WealthMoments):
+    """
+    Combine the moments of two disjoint groups of households using the
+    parallel update formula of Chan, Golub and LeVeque.
+
+    Parameters
+    ----------
+    m1, m2 : WealthMoments
+
+    Returns
+    -------
+    WealthMoments
+        Moments of the combined group.
+    """
+
+    n = m1.n + m2.n
+    delta = m2.mean - m1.mean
+
+    mean = m1.mean + delta * (m2.n / n)
+    M2 = m1.M2 + m2.M2 + delta**2 * (m1.n * m2.n / n)
+
+    return WealthMoments(n=n, mean=mean, M2=M2)
+
+
+def _simulate_shard(simulate, par, a0, T, N, seed):
+    """
+    Simulate one shard of households and return its moments.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    mean = np.empty(T+1)
+    M2 = np.empty(T+1)
+
+    for t, a in enumerate(simulate(par, a0, T, N, rng)):
+        mean[t] = np.mean(a)
+        M2[t] = np.sum((a - mean[t])**2)
+
+    return WealthMoments(n=N, mean=mean, M2=M2)
+
+
+def simulate_wealth_parallel(par, a0, T, N, seed=1234, simulate=iter_wealth_ar1_income,
+                             shard_size=100_000, workers=None):
+    """
+    Simulate wealth dynamics in parallel and return cross-sectional moments.
+
+    Parameters
+    ----------
+    par : Parameters
+        Parameters of the model simulated by `simulate`.
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    seed : int
+        Seed of the root SeedSequence.
+    simulate : callable
+        Function with signature simulate(par, a0, T, N, rng) which yields
+        cross sections of wealth, e.g. iter_wealth_ar1_income() or
+        iter_wealth_iid_income().
+    shard_size : int
+        Number of households per shard. Results depend on the shard size
+        but not on the number of workers.
+    workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+
+    Returns
+    -------
+    WealthMoments
+        Cross-sectional moments of wealth in periods 0,...,T.
+    """
+
+    if workers is None:
+        workers = os.cpu_count()
+
+    # Number of households in each shard
+    sizes = [min(shard_size, N - i) for i in range(0, N, shard_size)]
+
+    # Independent random number stream for each shard
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    args = [(simulate, par, a0, T, n, s) for n, s in zip(sizes, seeds)]
+
+    if workers == 1:
+        results = [_simulate_shard(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_simulate_shard, *arg) for arg in args]
+            results = [future.result() for future in futures]
+
+    # Merge shards in a fixed order so that results are reproducible
+    moments = results[0]
+    for m in results[1:]:
+        moments = merge_moments(moments, m)
+
+    return moments
+
+
+if __name__ == '__main__':
+
+    import time
+    from lecture08_ar1_income import Parameters, compute_wealth_mean
+
+    par = Parameters()
+
+    a0 = 1.0
+    T = 100
+    N = 1_000_000
+
+    for workers in (1, 2, 4):
+        t0 = time.perf_counter()
+        moments = simulate_wealth_parallel(par, a0, T, N, workers=workers)
+        t1 = time.perf_counter()
+        print(f'{workers} worker(s): {t1 - t0:.2f} sec., '
+              f'mean = {moments.mean[-1]:.15f}, var = {moments.var[-1]:.15f}')
+
+    print(f'Exact stationary mean: {compute_wealth_mean(par):.5f}')
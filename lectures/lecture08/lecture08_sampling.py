@@ -0,0 +1,221 @@
+"""
+Lecture 8: Samplers for the shocks of wealth simulations
+
+The streaming wealth simulators draw standard normal shocks for `chunk`
+periods and N households at a time. Each sampler below fills such an array
+of shape (chunk, N) in place and can be passed to the simulators with the
+`sampler` argument:
+
+    pseudo_normal       Pseudo-random draws (the default)
+    antithetic_normal   Antithetic pairs: household i + N/2 receives the
+                        negated shocks of household i
+    sobol_normal        Scrambled Sobol points mapped to normal draws with
+                        the inverse normal CDF (randomized quasi-Monte Carlo)
+
+For the Sobol sampler, each household is one point of a scrambled Sobol
+sequence whose dimensions are the periods of the current chunk. Each chunk
+uses an independently scrambled sequence whose points are assigned to
+households in random order (padding as in the Latin supercube sampling of
+Owen, 1998), so that shocks of a household in different chunks are
+independent. Estimates remain unbiased and their standard error can be
+computed from independent replications. N should be a power of 2.
+
+With persistent shocks (AR(1) income), the Sobol sampler works better the
+more periods it covers jointly, so it should be used with a larger `chunk`
+(at the cost of a larger buffer of shocks).
+
+Since households are not independent with antithetic or Sobol draws, the
+cross-sectional variance divided by N is not the standard error of the
+mean. The benchmark in this module therefore computes standard errors from
+independent replications. It also reports the efficiency of each sampler
+relative to pseudo-random draws, i.e. the ratio of SE^2 * run time, which
+is the factor by which fewer households (or less time) are needed for the
+same precision.
+
+Results with T = 100 periods, chunk = T and N = 2^14 households (20
+replications):
+
+                    SE of mean (efficiency)
+                    IID income          AR(1) income
+    pseudo          1.75e-03 (1)        1.27e-02 (1)
+    antithetic      1.65e-04 (177)      3.59e-03 (20)
+    sobol           4.39e-06 (87503)    7.49e-04 (177)
+
+Antithetic pairs do not reduce the SE of the cross-sectional variance of
+wealth, which is an even function of the shocks. Run this module to
+reproduce the comparison.
+"""
+
+import time
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+def pseudo_normal(rng, out):
+    """
+    Fill an array with pseudo-random standard normal draws.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        A random number generator instance.
+    out : numpy.ndarray
+        Array of shape (n, N) to fill, one row per period.
+    """
+
+    rng.standard_normal(dtype=out.dtype, out=out)
+
+
+def antithetic_normal(rng, out):
+    """
+    Fill an array with antithetic pairs of standard normal draws.
+
+    The first half of the columns (households) receives pseudo-random
+    draws, and the second half receives the same draws with the opposite
+    sign. If the number of columns is odd, the last column receives
+    independent draws.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        A random number generator instance.
+    out : numpy.ndarray
+        Array of shape (n, N) to fill, one row per period.
+    """
+
+    n, N = out.shape
+    half = N // 2
+
+    z = rng.standard_normal((n, half), dtype=out.dtype)
+    out[:, :half] = z
+    np.negative(z, out=out[:, half:2*half])
+
+    if N % 2 == 1:
+        out[:, -1] = rng.standard_normal(n, dtype=out.dtype)
+
+
+def sobol_normal(rng, out):
+    """
+    Fill an array with standard normal draws from a scrambled Sobol
+    sequence.
+
+    Each column (household) is one point of an n-dimensional Sobol
+    sequence, scrambled with a seed drawn from rng, and mapped to normal
+    draws with the inverse normal CDF. Points are assigned to households
+    in random order.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        A random number generator instance.
+    out : numpy.ndarray
+        Array of shape (n, N) to fill, one row per period. N should be a
+        power of 2.
+    """
+
+    n, N = out.shape
+
+    sobol = qmc.Sobol(d=n, scramble=True, seed=rng)
+    u = sobol.random(N)
+
+    # Randomly assign points to households. Otherwise, household i would
+    # receive the i-th point in every chunk, and since scrambling preserves
+    # the structure of the sequence, its shocks in different chunks would
+    # be dependent.
+    u = u[rng.permutation(N)]
+
+    out[...] = ndtri(u).T
+
+
+def run_replications(simulate, par, a0, T, N, sampler, n_rep=20, seed=1234, **kwargs):
+    """
+    Simulate wealth repeatedly with independent random number streams and
+    return the cross-sectional mean and variance in the last period.
+
+    Parameters
+    ----------
+    simulate : callable
+        Streaming simulator, e.g. iter_wealth_iid_income().
+    par : Parameters
+    a0 : float
+        Initial wealth.
+    T : int
+        Number of time periods to simulate.
+    N : int
+        Number of individuals to simulate.
+    sampler : callable
+        Sampler for standard normal shocks, e.g. sobol_normal().
+    n_rep : int
+        Number of independent replications.
+    seed : int
+        Seed used to create independent streams for all replications.
+    **kwargs
+        Additional arguments passed to `simulate` (e.g. chunk).
+
+    Returns
+    -------
+    mean : numpy.ndarray
+        Mean of wealth in period T for each replication
+    var : numpy.ndarray
+        Variance of wealth in period T for each replication
+    seconds : float
+        Average run time per replication
+    """
+
+    mean = np.empty(n_rep)
+    var = np.empty(n_rep)
+
+    t0 = time.perf_counter()
+
+    for i, ss in enumerate(np.random.SeedSequence(seed).spawn(n_rep)):
+        rng = np.random.default_rng(ss)
+        for a in simulate(par, a0, T, N, rng, sampler=sampler, reuse=True, **kwargs):
+            pass
+        mean[i] = np.mean(a)
+        var[i] = np.var(a)
+
+    t1 = time.perf_counter()
+
+    return mean, var, (t1 - t0) / n_rep
+
+
+if __name__ == '__main__':
+
+    import lecture08_iid_income as iid
+    import lecture08_ar1_income as ar1
+
+    a0 = 1.0
+    T = 100
+    n_rep = 20
+
+    samplers = {
+        'pseudo': pseudo_normal,
+        'antithetic': antithetic_normal,
+        'sobol': sobol_normal,
+    }
+
+    for name, module, simulate in [
+        ('IID income', iid, iid.iter_wealth_iid_income),
+        ('AR(1) income', ar1, ar1.iter_wealth_ar1_income),
+    ]:
+        par = module.Parameters()
+        a_mean = module.compute_wealth_mean(par)
+        print(f'{name}: stationary mean {a_mean:.6f}')
+
+        for N in (2**12, 2**14, 2**16):
+            results = {
+                label: run_replications(simulate, par, a0, T, N, sampler, n_rep, chunk=T)
+                for label, sampler in samplers.items()
+            }
+            mean, var, seconds = results['pseudo']
+            work_pseudo = np.var(mean, ddof=1) * seconds
+
+            for label, (mean, var, seconds) in results.items():
+                se_mean = np.std(mean, ddof=1)
+                print(f'  N = {N:6d}, {label:>10s}: {seconds:.3f} sec., '
+                      f'SE of mean {se_mean:.2e}, '
+                      f'SE of variance {np.std(var, ddof=1):.2e}, '
+                      f'bias of mean {np.mean(mean) - a_mean:+.1e}, '
+                      f'efficiency {work_pseudo / (se_mean**2 * seconds):.0f}')
@@ -3,6 +3,9 @@ Lecture 8: with with statistics functions (Gini)
 """
 
 import numpy as np
+from dataclasses import dataclass, fields
+
+import inequality
 
 def gini(x):
     """
@@ -19,16 +22,113 @@ def gini(x):
         The Gini coefficient.
     """
 
-    # Sort the array
+    # See inequality.gini() for batched and weighted versions
+    return inequality.gini(x)
+
+
+@dataclass
+class CrossSectionStats:
+    """
+    Container to store statistics of a cross section (or of a sequence of
+    cross sections, with one row per period)
+    """
+    mean: np.ndarray = None         # Mean
+    var: np.ndarray = None          # Variance
+    q: np.ndarray = None            # Quantile levels
+    quantiles: np.ndarray = None    # Quantiles at levels q
+    gini: np.ndarray = None         # Gini coefficient
+    top: np.ndarray = None          # Fractions of top of the distribution
+    top_shares: np.ndarray = None   # Shares of total held by top fractions
+
+
+def compute_cross_section_stats(x, q=(0.1, 0.25, 0.5, 0.75, 0.9), top=(0.01, 0.1)):
+    """
+    Compute summary statistics of a cross section.
+
+    The array is sorted once and the sorted array is used for the quantiles,
+    the Gini coefficient and the top shares (as defined in
+    inequality.top_shares()).
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        An array of income, wealth, etc.
+    q : sequence of float
+        Quantile levels.
+    top : sequence of float
+        Fractions of observations at the top of the distribution for which
+        the share of the total is computed (e.g. 0.01 for the top 1%).
+
+    Returns
+    -------
+    CrossSectionStats
+    """
+
+    q = np.asarray(q)
+    top = np.asarray(top)
+
     x_sorted = np.sort(x)
 
-    # The number of observations
-    N = len(x)
+    # Gini coefficient and top shares of the sorted array (both computed in
+    # double precision, float32 sums of many values lose several digits)
+    G = inequality.gini(x_sorted, assume_sorted=True)
+    top_shares = inequality.top_shares(x_sorted, top, assume_sorted=True)
+
+    stats = CrossSectionStats(
+        mean=np.mean(x_sorted, dtype=np.float64),
+        var=np.var(x_sorted, dtype=np.float64),
+        q=q,
+        quantiles=np.quantile(x_sorted, q),
+        gini=G,
+        top=top,
+        top_shares=top_shares,
+    )
+
+    return stats
+
+
+def stream_stats(cross_sections, q=(0.1, 0.25, 0.5, 0.75, 0.9), top=(0.01, 0.1)):
+    """
+    Compute statistics for each cross section of a simulation.
+
+    Parameters
+    ----------
+    cross_sections : iterable of numpy.ndarray
+        Cross sections of a simulation, one per period.
+    q : sequence of float
+        Quantile levels.
+    top : sequence of float
+        Top fractions for which shares are computed.
+
+    Yields
+    ------
+    CrossSectionStats
+        Statistics of each cross section.
+    """
+
+    for x in cross_sections:
+        yield compute_cross_section_stats(x, q, top)
+
+
+def stack_stats(records):
+    """
+    Combine statistics of individual periods into arrays.
+
+    Parameters
+    ----------
+    records : iterable of CrossSectionStats
+
+    Returns
+    -------
+    CrossSectionStats
+        Statistics with one row per period (q and top are not stacked).
+    """
 
-    ii = np.arange(1, N+1)
+    records = list(records)
 
-    # Compute the Gini coefficient
-    # Use Alternative Formula from Wiki for sorted arrays
-    G = 2*np.sum(ii * x_sorted) / (N * np.sum(x_sorted)) - (N + 1) / N
+    values = {
+        f.name: np.array([getattr(r, f.name) for r in records])
+        for f in fields(CrossSectionStats) if f.name not in ('q', 'top')
+    }
 
-    return G
+    return CrossSectionStats(q=records[0].q, top=records[0].top, **values)